@@ -21,6 +21,63 @@ INST_CYCLES = {
 }
 
 
+class AddressBitmap:
+    """
+    Set of 16-bit addresses backed by an 8KB bitmap (one bit per address).
+
+    Supports the set operations the debugger uses (add, discard, in, len,
+    iteration). Hot loops can skip the method calls: ``count`` is the number
+    of addresses set, and ``bits[addr >> 3] >> (addr & 7) & 1`` tests one.
+    """
+
+    __slots__ = ('bits', 'count')
+
+    def __init__(self, addrs=()):
+        self.bits = bytearray(0x2000)
+        self.count = 0
+        for addr in addrs:
+            self.add(addr)
+
+    def add(self, addr: int):
+        addr &= 0xFFFF
+        mask = 1 << (addr & 7)
+        if not self.bits[addr >> 3] & mask:
+            self.bits[addr >> 3] |= mask
+            self.count += 1
+
+    def discard(self, addr: int):
+        addr &= 0xFFFF
+        mask = 1 << (addr & 7)
+        if self.bits[addr >> 3] & mask:
+            self.bits[addr >> 3] &= ~mask
+            self.count -= 1
+
+    def remove(self, addr: int):
+        if addr not in self:
+            raise KeyError(addr)
+        self.discard(addr)
+
+    def clear(self):
+        self.bits[:] = bytes(0x2000)
+        self.count = 0
+
+    def __contains__(self, addr: int) -> bool:
+        return 0 <= addr <= 0xFFFF and bool(self.bits[addr >> 3] >> (addr & 7) & 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        for index, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield (index << 3) | bit
+
+    def __repr__(self) -> str:
+        return f"AddressBitmap({sorted(self)!r})"
+
+
 @dataclass
 class CPU8051:
     """8051 CPU emulator with ASM2464PD extensions."""
@@ -50,9 +107,8 @@ class CPU8051:
     # Halt flag
     halted: bool = False
 
-    # Debug/trace
-    trace: bool = False
-    breakpoints: set = field(default_factory=set)
+    # Debug
+    breakpoints: AddressBitmap = field(default_factory=AddressBitmap)
     _timer0_pending: bool = False  # Timer 0 interrupt pending flag
     _ext0_pending: bool = False     # External Interrupt 0 pending flag
     _ext1_pending: bool = False     # External Interrupt 1 pending flag
@@ -251,7 +307,7 @@ class CPU8051:
         # Check External Interrupt 0 (EX0 bit 0)
         # ASM2464PD uses EX0 (at 0x0003) for main ISR at 0x0E33
         if ie & 0x01:  # EX0 enabled
-            if hasattr(self, '_ext0_pending') and self._ext0_pending:
+            if self._ext0_pending:
                 self._ext0_pending = False
                 # Push return address onto stack before jumping to ISR
                 # Order matches LCALL: low byte first, high byte second
@@ -264,14 +320,14 @@ class CPU8051:
 
         # Check Timer 0 interrupt (ET0 bit 1)
         if ie & 0x02:  # ET0 enabled
-            if hasattr(self, '_timer0_pending') and self._timer0_pending:
+            if self._timer0_pending:
                 self._timer0_pending = False
                 self._trigger_interrupt(1)  # Timer 0 interrupt vector at 0x0B
 
         # Check External Interrupt 1 (EX1 bit 2)
         # ASM2464PD uses EX1 (at 0x0013) as main ISR, not Timer 0
         if ie & 0x04:  # EX1 enabled
-            if hasattr(self, '_ext1_pending') and self._ext1_pending:
+            if self._ext1_pending:
                 self._ext1_pending = False
                 self._trigger_interrupt(2)  # EX1 interrupt vector at 0x13
 
@@ -294,856 +350,866 @@ class CPU8051:
         if self.halted:
             return 1
 
-        if self.pc in self.breakpoints:
-            self.halted = True
-            return 0
+        bps = self.breakpoints
+        if bps.count:
+            pc = self.pc
+            if bps.bits[pc >> 3] >> (pc & 7) & 1:
+                self.halted = True
+                return 0
 
         opcode = self.fetch()
         cycles = self.execute(opcode)
         self.cycles += cycles
 
-        # Check for interrupts after executing instruction (so hardware can set flags)
-        self._check_interrupts()
+        # Check for interrupts after executing instruction (so hardware can set flags).
+        # Only a pending flag can start one, so skip the IE read when none is set.
+        if self._ext0_pending or self._ext1_pending or self._timer0_pending:
+            self._check_interrupts()
 
         return cycles
 
     def execute(self, opcode: int) -> int:
         """Execute instruction by opcode. Returns cycles consumed."""
-
-        # Decode and execute based on opcode
-        # This is a large switch-like implementation
-
-        if opcode == 0x00:  # NOP
-            return 1
-
-        # AJMP addr11 - 5 variants (0x01, 0x21, 0x41, 0x61, 0x81, 0xA1, 0xC1, 0xE1)
-        elif opcode & 0x1F == 0x01:
-            addr11 = ((opcode & 0xE0) << 3) | self.fetch()
-            self.pc = (self.pc & 0xF800) | addr11
-            return 2
-
-        # LJMP addr16
-        elif opcode == 0x02:
-            self.pc = self.fetch16()
-            return 2
-
-        # RR A
-        elif opcode == 0x03:
-            a = self.A
-            self.A = ((a >> 1) | (a << 7)) & 0xFF
-            return 1
-
-        # INC A
-        elif opcode == 0x04:
-            self.A = (self.A + 1) & 0xFF
-            return 1
-
-        # INC direct
-        elif opcode == 0x05:
-            addr = self.fetch()
-            self.set_direct(addr, (self.get_direct(addr) + 1) & 0xFF)
-            return 1
-
-        # INC @R0
-        elif opcode == 0x06:
-            addr = self.get_reg(0)
-            self.write_idata(addr, (self.read_idata(addr) + 1) & 0xFF)
-            return 1
-
-        # INC @R1
-        elif opcode == 0x07:
-            addr = self.get_reg(1)
-            self.write_idata(addr, (self.read_idata(addr) + 1) & 0xFF)
-            return 1
-
-        # INC R0-R7
-        elif 0x08 <= opcode <= 0x0F:
-            n = opcode & 0x07
-            self.set_reg(n, (self.get_reg(n) + 1) & 0xFF)
-            return 1
-
-        # JBC bit, rel
-        elif opcode == 0x10:
-            bit = self.fetch()
-            rel = self.fetch()
-            if self.read_bit(bit):
-                self.write_bit(bit, False)
-                self.rel_jump(rel)
-            return 2
-
-        # ACALL addr11 - 5 variants
-        elif opcode & 0x1F == 0x11:
-            addr11 = ((opcode & 0xE0) << 3) | self.fetch()
-            self.push(self.pc & 0xFF)
-            self.push((self.pc >> 8) & 0xFF)
-            self.pc = (self.pc & 0xF800) | addr11
-            return 2
-
-        # LCALL addr16
-        elif opcode == 0x12:
-            addr = self.fetch16()
-            self.push(self.pc & 0xFF)
-            self.push((self.pc >> 8) & 0xFF)
-            self.pc = addr
-            return 2
-
-        # RRC A
-        elif opcode == 0x13:
-            a = self.A
-            c = 1 if self.CY else 0
-            self.CY = bool(a & 1)
-            self.A = (c << 7) | (a >> 1)
-            return 1
-
-        # DEC A
-        elif opcode == 0x14:
-            self.A = (self.A - 1) & 0xFF
-            return 1
-
-        # DEC direct
-        elif opcode == 0x15:
-            addr = self.fetch()
-            self.set_direct(addr, (self.get_direct(addr) - 1) & 0xFF)
-            return 1
-
-        # DEC @R0
-        elif opcode == 0x16:
-            addr = self.get_reg(0)
-            self.write_idata(addr, (self.read_idata(addr) - 1) & 0xFF)
-            return 1
-
-        # DEC @R1
-        elif opcode == 0x17:
-            addr = self.get_reg(1)
-            self.write_idata(addr, (self.read_idata(addr) - 1) & 0xFF)
-            return 1
-
-        # DEC R0-R7
-        elif 0x18 <= opcode <= 0x1F:
-            n = opcode & 0x07
-            self.set_reg(n, (self.get_reg(n) - 1) & 0xFF)
-            return 1
-
-        # JB bit, rel
-        elif opcode == 0x20:
-            bit = self.fetch()
-            rel = self.fetch()
-            if self.read_bit(bit):
-                self.rel_jump(rel)
-            return 2
-
-        # RET
-        elif opcode == 0x22:
-            hi = self.pop()
-            lo = self.pop()
-            self.pc = (hi << 8) | lo
-            return 2
-
-        # RL A
-        elif opcode == 0x23:
-            a = self.A
-            self.A = ((a << 1) | (a >> 7)) & 0xFF
-            return 1
-
-        # ADD A, #imm
-        elif opcode == 0x24:
-            imm = self.fetch()
-            self._add(imm, False)
-            return 1
-
-        # ADD A, direct
-        elif opcode == 0x25:
-            addr = self.fetch()
-            self._add(self.get_direct(addr), False)
-            return 1
-
-        # ADD A, @R0
-        elif opcode == 0x26:
-            self._add(self.read_idata(self.get_reg(0)), False)
-            return 1
-
-        # ADD A, @R1
-        elif opcode == 0x27:
-            self._add(self.read_idata(self.get_reg(1)), False)
-            return 1
-
-        # ADD A, R0-R7
-        elif 0x28 <= opcode <= 0x2F:
-            self._add(self.get_reg(opcode & 0x07), False)
-            return 1
-
-        # JNB bit, rel
-        elif opcode == 0x30:
-            bit = self.fetch()
-            rel = self.fetch()
-            if not self.read_bit(bit):
-                self.rel_jump(rel)
-            return 2
-
-        # RETI
-        elif opcode == 0x32:
-            hi = self.pop()
-            lo = self.pop()
-            self.pc = (hi << 8) | lo
-            self.in_interrupt = False
-            return 2
-
-        # RLC A
-        elif opcode == 0x33:
-            a = self.A
-            c = 1 if self.CY else 0
-            self.CY = bool(a & 0x80)
-            self.A = ((a << 1) | c) & 0xFF
-            return 1
-
-        # ADDC A, #imm
-        elif opcode == 0x34:
-            imm = self.fetch()
-            self._add(imm, True)
-            return 1
-
-        # ADDC A, direct
-        elif opcode == 0x35:
-            addr = self.fetch()
-            self._add(self.get_direct(addr), True)
-            return 1
-
-        # ADDC A, @R0
-        elif opcode == 0x36:
-            self._add(self.read_idata(self.get_reg(0)), True)
-            return 1
-
-        # ADDC A, @R1
-        elif opcode == 0x37:
-            self._add(self.read_idata(self.get_reg(1)), True)
-            return 1
-
-        # ADDC A, R0-R7
-        elif 0x38 <= opcode <= 0x3F:
-            self._add(self.get_reg(opcode & 0x07), True)
-            return 1
-
-        # JC rel
-        elif opcode == 0x40:
-            rel = self.fetch()
-            if self.CY:
-                self.rel_jump(rel)
-            return 2
-
-        # ORL direct, A
-        elif opcode == 0x42:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) | self.A)
-            return 1
-
-        # ORL direct, #imm
-        elif opcode == 0x43:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) | imm)
-            return 2
-
-        # ORL A, #imm
-        elif opcode == 0x44:
-            self.A = self.A | self.fetch()
-            return 1
-
-        # ORL A, direct
-        elif opcode == 0x45:
-            addr = self.fetch()
-            self.A = self.A | self.get_direct(addr)
-            return 1
-
-        # ORL A, @R0
-        elif opcode == 0x46:
-            self.A = self.A | self.read_idata(self.get_reg(0))
-            return 1
-
-        # ORL A, @R1
-        elif opcode == 0x47:
-            self.A = self.A | self.read_idata(self.get_reg(1))
-            return 1
-
-        # ORL A, R0-R7
-        elif 0x48 <= opcode <= 0x4F:
-            self.A = self.A | self.get_reg(opcode & 0x07)
-            return 1
-
-        # JNC rel
-        elif opcode == 0x50:
-            rel = self.fetch()
-            if not self.CY:
-                self.rel_jump(rel)
-            return 2
-
-        # ANL direct, A
-        elif opcode == 0x52:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) & self.A)
-            return 1
-
-        # ANL direct, #imm
-        elif opcode == 0x53:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) & imm)
-            return 2
-
-        # ANL A, #imm
-        elif opcode == 0x54:
-            self.A = self.A & self.fetch()
-            return 1
-
-        # ANL A, direct
-        elif opcode == 0x55:
-            addr = self.fetch()
-            self.A = self.A & self.get_direct(addr)
-            return 1
-
-        # ANL A, @R0
-        elif opcode == 0x56:
-            self.A = self.A & self.read_idata(self.get_reg(0))
-            return 1
-
-        # ANL A, @R1
-        elif opcode == 0x57:
-            self.A = self.A & self.read_idata(self.get_reg(1))
-            return 1
-
-        # ANL A, R0-R7
-        elif 0x58 <= opcode <= 0x5F:
-            self.A = self.A & self.get_reg(opcode & 0x07)
-            return 1
-
-        # JZ rel
-        elif opcode == 0x60:
-            rel = self.fetch()
-            if self.A == 0:
-                self.rel_jump(rel)
-            return 2
-
-        # XRL direct, A
-        elif opcode == 0x62:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) ^ self.A)
-            return 1
-
-        # XRL direct, #imm
-        elif opcode == 0x63:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) ^ imm)
-            return 2
-
-        # XRL A, #imm
-        elif opcode == 0x64:
-            self.A = self.A ^ self.fetch()
-            return 1
-
-        # XRL A, direct
-        elif opcode == 0x65:
-            addr = self.fetch()
-            self.A = self.A ^ self.get_direct(addr)
-            return 1
-
-        # XRL A, @R0
-        elif opcode == 0x66:
-            self.A = self.A ^ self.read_idata(self.get_reg(0))
-            return 1
-
-        # XRL A, @R1
-        elif opcode == 0x67:
-            self.A = self.A ^ self.read_idata(self.get_reg(1))
-            return 1
-
-        # XRL A, R0-R7
-        elif 0x68 <= opcode <= 0x6F:
-            self.A = self.A ^ self.get_reg(opcode & 0x07)
-            return 1
-
-        # JNZ rel
-        elif opcode == 0x70:
-            rel = self.fetch()
-            if self.A != 0:
-                self.rel_jump(rel)
-            return 2
-
-        # ORL C, bit
-        elif opcode == 0x72:
-            bit = self.fetch()
-            self.CY = self.CY or self.read_bit(bit)
-            return 2
-
-        # JMP @A+DPTR
-        elif opcode == 0x73:
-            self.pc = (self.A + self.DPTR) & 0xFFFF
-            return 2
-
-        # MOV A, #imm
-        elif opcode == 0x74:
-            self.A = self.fetch()
-            return 1
-
-        # MOV direct, #imm
-        elif opcode == 0x75:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, imm)
-            return 2
-
-        # MOV @R0, #imm
-        elif opcode == 0x76:
-            imm = self.fetch()
-            self.write_idata(self.get_reg(0), imm)
-            return 1
-
-        # MOV @R1, #imm
-        elif opcode == 0x77:
-            imm = self.fetch()
-            self.write_idata(self.get_reg(1), imm)
-            return 1
-
-        # MOV R0-R7, #imm
-        elif 0x78 <= opcode <= 0x7F:
-            imm = self.fetch()
-            self.set_reg(opcode & 0x07, imm)
-            return 1
-
-        # SJMP rel
-        elif opcode == 0x80:
-            rel = self.fetch()
-            self.rel_jump(rel)
-            return 2
-
-        # ANL C, bit
-        elif opcode == 0x82:
-            bit = self.fetch()
-            self.CY = self.CY and self.read_bit(bit)
-            return 2
-
-        # MOVC A, @A+PC
-        elif opcode == 0x83:
-            addr = (self.A + self.pc) & 0xFFFF
-            self.A = self.read_code(addr)
-            return 2
-
-        # DIV AB
-        elif opcode == 0x84:
-            if self.B == 0:
-                self.OV = True
-            else:
-                q = self.A // self.B
-                r = self.A % self.B
-                self.A = q
-                self.B = r
-                self.OV = False
-            self.CY = False
-            return 4
-
-        # MOV direct, direct
-        elif opcode == 0x85:
-            src = self.fetch()
-            dst = self.fetch()
-            self.set_direct(dst, self.get_direct(src))
-            return 2
-
-        # MOV direct, @R0
-        elif opcode == 0x86:
-            addr = self.fetch()
-            self.set_direct(addr, self.read_idata(self.get_reg(0)))
-            return 2
-
-        # MOV direct, @R1
-        elif opcode == 0x87:
-            addr = self.fetch()
-            self.set_direct(addr, self.read_idata(self.get_reg(1)))
-            return 2
-
-        # MOV direct, R0-R7
-        elif 0x88 <= opcode <= 0x8F:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_reg(opcode & 0x07))
-            return 2
-
-        # MOV DPTR, #imm16
-        elif opcode == 0x90:
-            self.DPTR = self.fetch16()
-            return 2
-
-        # MOV bit, C
-        elif opcode == 0x92:
-            bit = self.fetch()
-            self.write_bit(bit, self.CY)
-            return 2
-
-        # MOVC A, @A+DPTR
-        elif opcode == 0x93:
-            addr = (self.A + self.DPTR) & 0xFFFF
-            self.A = self.read_code(addr)
-            return 2
-
-        # SUBB A, #imm
-        elif opcode == 0x94:
-            imm = self.fetch()
-            self._subb(imm)
-            return 1
-
-        # SUBB A, direct
-        elif opcode == 0x95:
-            addr = self.fetch()
-            self._subb(self.get_direct(addr))
-            return 1
-
-        # SUBB A, @R0
-        elif opcode == 0x96:
-            self._subb(self.read_idata(self.get_reg(0)))
-            return 1
-
-        # SUBB A, @R1
-        elif opcode == 0x97:
-            self._subb(self.read_idata(self.get_reg(1)))
-            return 1
-
-        # SUBB A, R0-R7
-        elif 0x98 <= opcode <= 0x9F:
-            self._subb(self.get_reg(opcode & 0x07))
-            return 1
-
-        # ORL C, /bit
-        elif opcode == 0xA0:
-            bit = self.fetch()
-            self.CY = self.CY or (not self.read_bit(bit))
-            return 2
-
-        # MOV C, bit
-        elif opcode == 0xA2:
-            bit = self.fetch()
-            self.CY = self.read_bit(bit)
-            return 1
-
-        # INC DPTR
-        elif opcode == 0xA3:
-            self.DPTR = (self.DPTR + 1) & 0xFFFF
-            return 2
-
-        # MUL AB
-        elif opcode == 0xA4:
-            result = self.A * self.B
-            self.A = result & 0xFF
-            self.B = (result >> 8) & 0xFF
-            self.CY = False
-            self.OV = (result > 0xFF)
-            return 4
-
-        # Reserved
-        elif opcode == 0xA5:
-            return 1
-
-        # MOV @R0, direct
-        elif opcode == 0xA6:
-            addr = self.fetch()
-            self.write_idata(self.get_reg(0), self.get_direct(addr))
-            return 2
-
-        # MOV @R1, direct
-        elif opcode == 0xA7:
-            addr = self.fetch()
-            self.write_idata(self.get_reg(1), self.get_direct(addr))
-            return 2
-
-        # MOV R0-R7, direct
-        elif 0xA8 <= opcode <= 0xAF:
-            addr = self.fetch()
-            self.set_reg(opcode & 0x07, self.get_direct(addr))
-            return 2
-
-        # ANL C, /bit
-        elif opcode == 0xB0:
-            bit = self.fetch()
-            self.CY = self.CY and (not self.read_bit(bit))
-            return 2
-
-        # CPL bit
-        elif opcode == 0xB2:
-            bit = self.fetch()
-            self.write_bit(bit, not self.read_bit(bit))
-            return 1
-
-        # CPL C
-        elif opcode == 0xB3:
-            self.CY = not self.CY
-            return 1
-
-        # CJNE A, #imm, rel
-        elif opcode == 0xB4:
-            imm = self.fetch()
-            rel = self.fetch()
-            self.CY = self.A < imm
-            if self.A != imm:
-                self.rel_jump(rel)
-            return 2
-
-        # CJNE A, direct, rel
-        elif opcode == 0xB5:
-            addr = self.fetch()
-            rel = self.fetch()
-            val = self.get_direct(addr)
-            self.CY = self.A < val
-            if self.A != val:
-                self.rel_jump(rel)
-            return 2
-
-        # CJNE @R0, #imm, rel
-        elif opcode == 0xB6:
-            imm = self.fetch()
-            rel = self.fetch()
-            val = self.read_idata(self.get_reg(0))
-            self.CY = val < imm
-            if val != imm:
-                self.rel_jump(rel)
-            return 2
-
-        # CJNE @R1, #imm, rel
-        elif opcode == 0xB7:
-            imm = self.fetch()
-            rel = self.fetch()
-            val = self.read_idata(self.get_reg(1))
-            self.CY = val < imm
-            if val != imm:
-                self.rel_jump(rel)
-            return 2
-
-        # CJNE R0-R7, #imm, rel
-        elif 0xB8 <= opcode <= 0xBF:
-            imm = self.fetch()
-            rel = self.fetch()
-            val = self.get_reg(opcode & 0x07)
-            self.CY = val < imm
-            if val != imm:
-                self.rel_jump(rel)
-            return 2
-
-        # PUSH direct
-        elif opcode == 0xC0:
-            addr = self.fetch()
-            self.push(self.get_direct(addr))
-            return 2
-
-        # CLR bit
-        elif opcode == 0xC2:
-            bit = self.fetch()
+        handler = _OPCODE_TABLE[opcode]
+        if handler is None:
+            raise ValueError(f"Unknown opcode: 0x{opcode:02X} at PC=0x{self.pc-1:04X}")
+        return handler(self, opcode)
+
+    # ============================================
+    # Opcode handlers
+    # ============================================
+    # One method per instruction (or register/bank variant group), bound to
+    # opcodes by _OPCODE_TABLE. Each takes the opcode and returns cycles.
+
+    def _op_nop(self, opcode: int) -> int:
+        """NOP"""
+        return 1
+
+    def _op_ajmp_addr11(self, opcode: int) -> int:
+        """AJMP addr11 (0x01, 0x21, 0x41, 0x61, 0x81, 0xA1, 0xC1, 0xE1)"""
+        addr11 = ((opcode & 0xE0) << 3) | self.fetch()
+        self.pc = (self.pc & 0xF800) | addr11
+        return 2
+
+    def _op_ljmp_addr16(self, opcode: int) -> int:
+        """LJMP addr16"""
+        self.pc = self.fetch16()
+        return 2
+
+    def _op_rr_a(self, opcode: int) -> int:
+        """RR A"""
+        a = self.A
+        self.A = ((a >> 1) | (a << 7)) & 0xFF
+        return 1
+
+    def _op_inc_a(self, opcode: int) -> int:
+        """INC A"""
+        self.A = (self.A + 1) & 0xFF
+        return 1
+
+    def _op_inc_direct(self, opcode: int) -> int:
+        """INC direct"""
+        addr = self.fetch()
+        self.set_direct(addr, (self.get_direct(addr) + 1) & 0xFF)
+        return 1
+
+    def _op_inc_at_r0(self, opcode: int) -> int:
+        """INC @R0"""
+        addr = self.get_reg(0)
+        self.write_idata(addr, (self.read_idata(addr) + 1) & 0xFF)
+        return 1
+
+    def _op_inc_at_r1(self, opcode: int) -> int:
+        """INC @R1"""
+        addr = self.get_reg(1)
+        self.write_idata(addr, (self.read_idata(addr) + 1) & 0xFF)
+        return 1
+
+    def _op_inc_rn(self, opcode: int) -> int:
+        """INC R0-R7"""
+        n = opcode & 0x07
+        self.set_reg(n, (self.get_reg(n) + 1) & 0xFF)
+        return 1
+
+    def _op_jbc_bit_rel(self, opcode: int) -> int:
+        """JBC bit, rel"""
+        bit = self.fetch()
+        rel = self.fetch()
+        if self.read_bit(bit):
             self.write_bit(bit, False)
-            return 1
-
-        # CLR C
-        elif opcode == 0xC3:
-            self.CY = False
-            return 1
-
-        # SWAP A
-        elif opcode == 0xC4:
-            a = self.A
-            self.A = ((a << 4) | (a >> 4)) & 0xFF
-            return 1
-
-        # XCH A, direct
-        elif opcode == 0xC5:
-            addr = self.fetch()
-            tmp = self.A
-            self.A = self.get_direct(addr)
-            self.set_direct(addr, tmp)
-            return 1
-
-        # XCH A, @R0
-        elif opcode == 0xC6:
-            ptr = self.get_reg(0)
-            tmp = self.A
-            self.A = self.read_idata(ptr)
-            self.write_idata(ptr, tmp)
-            return 1
-
-        # XCH A, @R1
-        elif opcode == 0xC7:
-            ptr = self.get_reg(1)
-            tmp = self.A
-            self.A = self.read_idata(ptr)
-            self.write_idata(ptr, tmp)
-            return 1
-
-        # XCH A, R0-R7
-        elif 0xC8 <= opcode <= 0xCF:
-            n = opcode & 0x07
-            tmp = self.A
-            self.A = self.get_reg(n)
-            self.set_reg(n, tmp)
-            return 1
-
-        # POP direct
-        elif opcode == 0xD0:
-            addr = self.fetch()
-            self.set_direct(addr, self.pop())
-            return 2
-
-        # SETB bit
-        elif opcode == 0xD2:
-            bit = self.fetch()
-            self.write_bit(bit, True)
-            return 1
-
-        # SETB C
-        elif opcode == 0xD3:
-            self.CY = True
-            return 1
-
-        # DA A (Decimal Adjust)
-        elif opcode == 0xD4:
-            a = self.A
-            cy = self.CY
-
-            if (a & 0x0F) > 9 or self.AC:
-                a += 6
-                if a > 0xFF:
-                    cy = True
-                    a &= 0xFF
-
-            if (a >> 4) > 9 or cy:
-                a += 0x60
-                if a > 0xFF:
-                    cy = True
-                    a &= 0xFF
-
-            self.A = a
-            self.CY = cy
-            return 1
-
-        # DJNZ direct, rel
-        elif opcode == 0xD5:
-            addr = self.fetch()
-            rel = self.fetch()
-            val = (self.get_direct(addr) - 1) & 0xFF
-            self.set_direct(addr, val)
-            if val != 0:
-                self.rel_jump(rel)
-            return 2
-
-        # XCHD A, @R0
-        elif opcode == 0xD6:
-            ptr = self.get_reg(0)
-            val = self.read_idata(ptr)
-            self.write_idata(ptr, (val & 0xF0) | (self.A & 0x0F))
-            self.A = (self.A & 0xF0) | (val & 0x0F)
-            return 1
-
-        # XCHD A, @R1
-        elif opcode == 0xD7:
-            ptr = self.get_reg(1)
-            val = self.read_idata(ptr)
-            self.write_idata(ptr, (val & 0xF0) | (self.A & 0x0F))
-            self.A = (self.A & 0xF0) | (val & 0x0F)
-            return 1
-
-        # DJNZ R0-R7, rel
-        elif 0xD8 <= opcode <= 0xDF:
-            rel = self.fetch()
-            n = opcode & 0x07
-            val = (self.get_reg(n) - 1) & 0xFF
-            self.set_reg(n, val)
-            if val != 0:
-                self.rel_jump(rel)
-            return 2
-
-        # MOVX A, @DPTR
-        elif opcode == 0xE0:
-            self.A = self.read_xdata(self.DPTR)
-            return 2
-
-        # CLR A
-        elif opcode == 0xE4:
-            self.A = 0
-            return 1
-
-        # MOV A, direct
-        elif opcode == 0xE5:
-            addr = self.fetch()
-            self.A = self.get_direct(addr)
-            return 1
-
-        # MOV A, @R0
-        elif opcode == 0xE6:
-            self.A = self.read_idata(self.get_reg(0))
-            return 1
-
-        # MOV A, @R1
-        elif opcode == 0xE7:
-            self.A = self.read_idata(self.get_reg(1))
-            return 1
-
-        # MOV A, R0-R7
-        elif 0xE8 <= opcode <= 0xEF:
-            self.A = self.get_reg(opcode & 0x07)
-            return 1
-
-        # MOVX @DPTR, A
-        elif opcode == 0xF0:
-            self.write_xdata(self.DPTR, self.A)
-            return 2
-
-        # MOVX A, @R0 (external with P2)
-        elif opcode == 0xE2:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(0)
-            self.A = self.read_xdata(addr)
-            return 2
-
-        # MOVX A, @R1 (external with P2)
-        elif opcode == 0xE3:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(1)
-            self.A = self.read_xdata(addr)
-            return 2
-
-        # MOVX @R0, A (external with P2)
-        elif opcode == 0xF2:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(0)
-            self.write_xdata(addr, self.A)
-            return 2
-
-        # MOVX @R1, A (external with P2)
-        elif opcode == 0xF3:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(1)
-            self.write_xdata(addr, self.A)
-            return 2
-
-        # CPL A - complement accumulator
-        elif opcode == 0xF4:
-            self.A = (~self.A) & 0xFF
-            return 1
-
-        # MOV direct, A
-        elif opcode == 0xF5:
-            addr = self.fetch()
-            self.set_direct(addr, self.A)
-            return 1
+            self.rel_jump(rel)
+        return 2
+
+    def _op_acall_addr11(self, opcode: int) -> int:
+        """ACALL addr11 (0x11, 0x31, ... 0xF1)"""
+        addr11 = ((opcode & 0xE0) << 3) | self.fetch()
+        self.push(self.pc & 0xFF)
+        self.push((self.pc >> 8) & 0xFF)
+        self.pc = (self.pc & 0xF800) | addr11
+        return 2
+
+    def _op_lcall_addr16(self, opcode: int) -> int:
+        """LCALL addr16"""
+        addr = self.fetch16()
+        self.push(self.pc & 0xFF)
+        self.push((self.pc >> 8) & 0xFF)
+        self.pc = addr
+        return 2
+
+    def _op_rrc_a(self, opcode: int) -> int:
+        """RRC A"""
+        a = self.A
+        c = 1 if self.CY else 0
+        self.CY = bool(a & 1)
+        self.A = (c << 7) | (a >> 1)
+        return 1
+
+    def _op_dec_a(self, opcode: int) -> int:
+        """DEC A"""
+        self.A = (self.A - 1) & 0xFF
+        return 1
+
+    def _op_dec_direct(self, opcode: int) -> int:
+        """DEC direct"""
+        addr = self.fetch()
+        self.set_direct(addr, (self.get_direct(addr) - 1) & 0xFF)
+        return 1
+
+    def _op_dec_at_r0(self, opcode: int) -> int:
+        """DEC @R0"""
+        addr = self.get_reg(0)
+        self.write_idata(addr, (self.read_idata(addr) - 1) & 0xFF)
+        return 1
+
+    def _op_dec_at_r1(self, opcode: int) -> int:
+        """DEC @R1"""
+        addr = self.get_reg(1)
+        self.write_idata(addr, (self.read_idata(addr) - 1) & 0xFF)
+        return 1
+
+    def _op_dec_rn(self, opcode: int) -> int:
+        """DEC R0-R7"""
+        n = opcode & 0x07
+        self.set_reg(n, (self.get_reg(n) - 1) & 0xFF)
+        return 1
+
+    def _op_jb_bit_rel(self, opcode: int) -> int:
+        """JB bit, rel"""
+        bit = self.fetch()
+        rel = self.fetch()
+        if self.read_bit(bit):
+            self.rel_jump(rel)
+        return 2
 
-        # MOV @R0, A
-        elif opcode == 0xF6:
-            self.write_idata(self.get_reg(0), self.A)
-            return 1
+    def _op_ret(self, opcode: int) -> int:
+        """RET"""
+        hi = self.pop()
+        lo = self.pop()
+        self.pc = (hi << 8) | lo
+        return 2
 
-        # MOV @R1, A
-        elif opcode == 0xF7:
-            self.write_idata(self.get_reg(1), self.A)
-            return 1
+    def _op_rl_a(self, opcode: int) -> int:
+        """RL A"""
+        a = self.A
+        self.A = ((a << 1) | (a >> 7)) & 0xFF
+        return 1
+
+    def _op_add_a_imm(self, opcode: int) -> int:
+        """ADD A, #imm"""
+        imm = self.fetch()
+        self._add(imm, False)
+        return 1
+
+    def _op_add_a_direct(self, opcode: int) -> int:
+        """ADD A, direct"""
+        addr = self.fetch()
+        self._add(self.get_direct(addr), False)
+        return 1
+
+    def _op_add_a_at_r0(self, opcode: int) -> int:
+        """ADD A, @R0"""
+        self._add(self.read_idata(self.get_reg(0)), False)
+        return 1
+
+    def _op_add_a_at_r1(self, opcode: int) -> int:
+        """ADD A, @R1"""
+        self._add(self.read_idata(self.get_reg(1)), False)
+        return 1
+
+    def _op_add_a_rn(self, opcode: int) -> int:
+        """ADD A, R0-R7"""
+        self._add(self.get_reg(opcode & 0x07), False)
+        return 1
+
+    def _op_jnb_bit_rel(self, opcode: int) -> int:
+        """JNB bit, rel"""
+        bit = self.fetch()
+        rel = self.fetch()
+        if not self.read_bit(bit):
+            self.rel_jump(rel)
+        return 2
 
-        # MOV R0-R7, A
-        elif 0xF8 <= opcode <= 0xFF:
-            self.set_reg(opcode & 0x07, self.A)
-            return 1
+    def _op_reti(self, opcode: int) -> int:
+        """RETI"""
+        hi = self.pop()
+        lo = self.pop()
+        self.pc = (hi << 8) | lo
+        self.in_interrupt = False
+        return 2
 
+    def _op_rlc_a(self, opcode: int) -> int:
+        """RLC A"""
+        a = self.A
+        c = 1 if self.CY else 0
+        self.CY = bool(a & 0x80)
+        self.A = ((a << 1) | c) & 0xFF
+        return 1
+
+    def _op_addc_a_imm(self, opcode: int) -> int:
+        """ADDC A, #imm"""
+        imm = self.fetch()
+        self._add(imm, True)
+        return 1
+
+    def _op_addc_a_direct(self, opcode: int) -> int:
+        """ADDC A, direct"""
+        addr = self.fetch()
+        self._add(self.get_direct(addr), True)
+        return 1
+
+    def _op_addc_a_at_r0(self, opcode: int) -> int:
+        """ADDC A, @R0"""
+        self._add(self.read_idata(self.get_reg(0)), True)
+        return 1
+
+    def _op_addc_a_at_r1(self, opcode: int) -> int:
+        """ADDC A, @R1"""
+        self._add(self.read_idata(self.get_reg(1)), True)
+        return 1
+
+    def _op_addc_a_rn(self, opcode: int) -> int:
+        """ADDC A, R0-R7"""
+        self._add(self.get_reg(opcode & 0x07), True)
+        return 1
+
+    def _op_jc_rel(self, opcode: int) -> int:
+        """JC rel"""
+        rel = self.fetch()
+        if self.CY:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_orl_direct_a(self, opcode: int) -> int:
+        """ORL direct, A"""
+        addr = self.fetch()
+        self.set_direct(addr, self.get_direct(addr) | self.A)
+        return 1
+
+    def _op_orl_direct_imm(self, opcode: int) -> int:
+        """ORL direct, #imm"""
+        addr = self.fetch()
+        imm = self.fetch()
+        self.set_direct(addr, self.get_direct(addr) | imm)
+        return 2
+
+    def _op_orl_a_imm(self, opcode: int) -> int:
+        """ORL A, #imm"""
+        self.A = self.A | self.fetch()
+        return 1
+
+    def _op_orl_a_direct(self, opcode: int) -> int:
+        """ORL A, direct"""
+        addr = self.fetch()
+        self.A = self.A | self.get_direct(addr)
+        return 1
+
+    def _op_orl_a_at_r0(self, opcode: int) -> int:
+        """ORL A, @R0"""
+        self.A = self.A | self.read_idata(self.get_reg(0))
+        return 1
+
+    def _op_orl_a_at_r1(self, opcode: int) -> int:
+        """ORL A, @R1"""
+        self.A = self.A | self.read_idata(self.get_reg(1))
+        return 1
+
+    def _op_orl_a_rn(self, opcode: int) -> int:
+        """ORL A, R0-R7"""
+        self.A = self.A | self.get_reg(opcode & 0x07)
+        return 1
+
+    def _op_jnc_rel(self, opcode: int) -> int:
+        """JNC rel"""
+        rel = self.fetch()
+        if not self.CY:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_anl_direct_a(self, opcode: int) -> int:
+        """ANL direct, A"""
+        addr = self.fetch()
+        self.set_direct(addr, self.get_direct(addr) & self.A)
+        return 1
+
+    def _op_anl_direct_imm(self, opcode: int) -> int:
+        """ANL direct, #imm"""
+        addr = self.fetch()
+        imm = self.fetch()
+        self.set_direct(addr, self.get_direct(addr) & imm)
+        return 2
+
+    def _op_anl_a_imm(self, opcode: int) -> int:
+        """ANL A, #imm"""
+        self.A = self.A & self.fetch()
+        return 1
+
+    def _op_anl_a_direct(self, opcode: int) -> int:
+        """ANL A, direct"""
+        addr = self.fetch()
+        self.A = self.A & self.get_direct(addr)
+        return 1
+
+    def _op_anl_a_at_r0(self, opcode: int) -> int:
+        """ANL A, @R0"""
+        self.A = self.A & self.read_idata(self.get_reg(0))
+        return 1
+
+    def _op_anl_a_at_r1(self, opcode: int) -> int:
+        """ANL A, @R1"""
+        self.A = self.A & self.read_idata(self.get_reg(1))
+        return 1
+
+    def _op_anl_a_rn(self, opcode: int) -> int:
+        """ANL A, R0-R7"""
+        self.A = self.A & self.get_reg(opcode & 0x07)
+        return 1
+
+    def _op_jz_rel(self, opcode: int) -> int:
+        """JZ rel"""
+        rel = self.fetch()
+        if self.A == 0:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_xrl_direct_a(self, opcode: int) -> int:
+        """XRL direct, A"""
+        addr = self.fetch()
+        self.set_direct(addr, self.get_direct(addr) ^ self.A)
+        return 1
+
+    def _op_xrl_direct_imm(self, opcode: int) -> int:
+        """XRL direct, #imm"""
+        addr = self.fetch()
+        imm = self.fetch()
+        self.set_direct(addr, self.get_direct(addr) ^ imm)
+        return 2
+
+    def _op_xrl_a_imm(self, opcode: int) -> int:
+        """XRL A, #imm"""
+        self.A = self.A ^ self.fetch()
+        return 1
+
+    def _op_xrl_a_direct(self, opcode: int) -> int:
+        """XRL A, direct"""
+        addr = self.fetch()
+        self.A = self.A ^ self.get_direct(addr)
+        return 1
+
+    def _op_xrl_a_at_r0(self, opcode: int) -> int:
+        """XRL A, @R0"""
+        self.A = self.A ^ self.read_idata(self.get_reg(0))
+        return 1
+
+    def _op_xrl_a_at_r1(self, opcode: int) -> int:
+        """XRL A, @R1"""
+        self.A = self.A ^ self.read_idata(self.get_reg(1))
+        return 1
+
+    def _op_xrl_a_rn(self, opcode: int) -> int:
+        """XRL A, R0-R7"""
+        self.A = self.A ^ self.get_reg(opcode & 0x07)
+        return 1
+
+    def _op_jnz_rel(self, opcode: int) -> int:
+        """JNZ rel"""
+        rel = self.fetch()
+        if self.A != 0:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_orl_c_bit(self, opcode: int) -> int:
+        """ORL C, bit"""
+        bit = self.fetch()
+        self.CY = self.CY or self.read_bit(bit)
+        return 2
+
+    def _op_jmp_a_dptr(self, opcode: int) -> int:
+        """JMP @A+DPTR"""
+        self.pc = (self.A + self.DPTR) & 0xFFFF
+        return 2
+
+    def _op_mov_a_imm(self, opcode: int) -> int:
+        """MOV A, #imm"""
+        self.A = self.fetch()
+        return 1
+
+    def _op_mov_direct_imm(self, opcode: int) -> int:
+        """MOV direct, #imm"""
+        addr = self.fetch()
+        imm = self.fetch()
+        self.set_direct(addr, imm)
+        return 2
+
+    def _op_mov_at_r0_imm(self, opcode: int) -> int:
+        """MOV @R0, #imm"""
+        imm = self.fetch()
+        self.write_idata(self.get_reg(0), imm)
+        return 1
+
+    def _op_mov_at_r1_imm(self, opcode: int) -> int:
+        """MOV @R1, #imm"""
+        imm = self.fetch()
+        self.write_idata(self.get_reg(1), imm)
+        return 1
+
+    def _op_mov_rn_imm(self, opcode: int) -> int:
+        """MOV R0-R7, #imm"""
+        imm = self.fetch()
+        self.set_reg(opcode & 0x07, imm)
+        return 1
+
+    def _op_sjmp_rel(self, opcode: int) -> int:
+        """SJMP rel"""
+        rel = self.fetch()
+        self.rel_jump(rel)
+        return 2
+
+    def _op_anl_c_bit(self, opcode: int) -> int:
+        """ANL C, bit"""
+        bit = self.fetch()
+        self.CY = self.CY and self.read_bit(bit)
+        return 2
+
+    def _op_movc_a_a_pc(self, opcode: int) -> int:
+        """MOVC A, @A+PC"""
+        addr = (self.A + self.pc) & 0xFFFF
+        self.A = self.read_code(addr)
+        return 2
+
+    def _op_div_ab(self, opcode: int) -> int:
+        """DIV AB"""
+        if self.B == 0:
+            self.OV = True
         else:
-            raise ValueError(f"Unknown opcode: 0x{opcode:02X} at PC=0x{self.pc-1:04X}")
+            q = self.A // self.B
+            r = self.A % self.B
+            self.A = q
+            self.B = r
+            self.OV = False
+        self.CY = False
+        return 4
+
+    def _op_mov_direct_direct(self, opcode: int) -> int:
+        """MOV direct, direct"""
+        src = self.fetch()
+        dst = self.fetch()
+        self.set_direct(dst, self.get_direct(src))
+        return 2
+
+    def _op_mov_direct_at_r0(self, opcode: int) -> int:
+        """MOV direct, @R0"""
+        addr = self.fetch()
+        self.set_direct(addr, self.read_idata(self.get_reg(0)))
+        return 2
+
+    def _op_mov_direct_at_r1(self, opcode: int) -> int:
+        """MOV direct, @R1"""
+        addr = self.fetch()
+        self.set_direct(addr, self.read_idata(self.get_reg(1)))
+        return 2
+
+    def _op_mov_direct_rn(self, opcode: int) -> int:
+        """MOV direct, R0-R7"""
+        addr = self.fetch()
+        self.set_direct(addr, self.get_reg(opcode & 0x07))
+        return 2
+
+    def _op_mov_dptr_imm16(self, opcode: int) -> int:
+        """MOV DPTR, #imm16"""
+        self.DPTR = self.fetch16()
+        return 2
+
+    def _op_mov_bit_c(self, opcode: int) -> int:
+        """MOV bit, C"""
+        bit = self.fetch()
+        self.write_bit(bit, self.CY)
+        return 2
+
+    def _op_movc_a_a_dptr(self, opcode: int) -> int:
+        """MOVC A, @A+DPTR"""
+        addr = (self.A + self.DPTR) & 0xFFFF
+        self.A = self.read_code(addr)
+        return 2
+
+    def _op_subb_a_imm(self, opcode: int) -> int:
+        """SUBB A, #imm"""
+        imm = self.fetch()
+        self._subb(imm)
+        return 1
+
+    def _op_subb_a_direct(self, opcode: int) -> int:
+        """SUBB A, direct"""
+        addr = self.fetch()
+        self._subb(self.get_direct(addr))
+        return 1
+
+    def _op_subb_a_at_r0(self, opcode: int) -> int:
+        """SUBB A, @R0"""
+        self._subb(self.read_idata(self.get_reg(0)))
+        return 1
+
+    def _op_subb_a_at_r1(self, opcode: int) -> int:
+        """SUBB A, @R1"""
+        self._subb(self.read_idata(self.get_reg(1)))
+        return 1
+
+    def _op_subb_a_rn(self, opcode: int) -> int:
+        """SUBB A, R0-R7"""
+        self._subb(self.get_reg(opcode & 0x07))
+        return 1
+
+    def _op_orl_c_nbit(self, opcode: int) -> int:
+        """ORL C, /bit"""
+        bit = self.fetch()
+        self.CY = self.CY or (not self.read_bit(bit))
+        return 2
+
+    def _op_mov_c_bit(self, opcode: int) -> int:
+        """MOV C, bit"""
+        bit = self.fetch()
+        self.CY = self.read_bit(bit)
+        return 1
+
+    def _op_inc_dptr(self, opcode: int) -> int:
+        """INC DPTR"""
+        self.DPTR = (self.DPTR + 1) & 0xFFFF
+        return 2
+
+    def _op_mul_ab(self, opcode: int) -> int:
+        """MUL AB"""
+        result = self.A * self.B
+        self.A = result & 0xFF
+        self.B = (result >> 8) & 0xFF
+        self.CY = False
+        self.OV = (result > 0xFF)
+        return 4
+
+    def _op_reserved(self, opcode: int) -> int:
+        """Reserved"""
+        return 1
+
+    def _op_mov_at_r0_direct(self, opcode: int) -> int:
+        """MOV @R0, direct"""
+        addr = self.fetch()
+        self.write_idata(self.get_reg(0), self.get_direct(addr))
+        return 2
+
+    def _op_mov_at_r1_direct(self, opcode: int) -> int:
+        """MOV @R1, direct"""
+        addr = self.fetch()
+        self.write_idata(self.get_reg(1), self.get_direct(addr))
+        return 2
+
+    def _op_mov_rn_direct(self, opcode: int) -> int:
+        """MOV R0-R7, direct"""
+        addr = self.fetch()
+        self.set_reg(opcode & 0x07, self.get_direct(addr))
+        return 2
+
+    def _op_anl_c_nbit(self, opcode: int) -> int:
+        """ANL C, /bit"""
+        bit = self.fetch()
+        self.CY = self.CY and (not self.read_bit(bit))
+        return 2
+
+    def _op_cpl_bit(self, opcode: int) -> int:
+        """CPL bit"""
+        bit = self.fetch()
+        self.write_bit(bit, not self.read_bit(bit))
+        return 1
+
+    def _op_cpl_c(self, opcode: int) -> int:
+        """CPL C"""
+        self.CY = not self.CY
+        return 1
+
+    def _op_cjne_a_imm_rel(self, opcode: int) -> int:
+        """CJNE A, #imm, rel"""
+        imm = self.fetch()
+        rel = self.fetch()
+        self.CY = self.A < imm
+        if self.A != imm:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_cjne_a_direct_rel(self, opcode: int) -> int:
+        """CJNE A, direct, rel"""
+        addr = self.fetch()
+        rel = self.fetch()
+        val = self.get_direct(addr)
+        self.CY = self.A < val
+        if self.A != val:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_cjne_at_r0_imm_rel(self, opcode: int) -> int:
+        """CJNE @R0, #imm, rel"""
+        imm = self.fetch()
+        rel = self.fetch()
+        val = self.read_idata(self.get_reg(0))
+        self.CY = val < imm
+        if val != imm:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_cjne_at_r1_imm_rel(self, opcode: int) -> int:
+        """CJNE @R1, #imm, rel"""
+        imm = self.fetch()
+        rel = self.fetch()
+        val = self.read_idata(self.get_reg(1))
+        self.CY = val < imm
+        if val != imm:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_cjne_rn_imm_rel(self, opcode: int) -> int:
+        """CJNE R0-R7, #imm, rel"""
+        imm = self.fetch()
+        rel = self.fetch()
+        val = self.get_reg(opcode & 0x07)
+        self.CY = val < imm
+        if val != imm:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_push_direct(self, opcode: int) -> int:
+        """PUSH direct"""
+        addr = self.fetch()
+        self.push(self.get_direct(addr))
+        return 2
+
+    def _op_clr_bit(self, opcode: int) -> int:
+        """CLR bit"""
+        bit = self.fetch()
+        self.write_bit(bit, False)
+        return 1
+
+    def _op_clr_c(self, opcode: int) -> int:
+        """CLR C"""
+        self.CY = False
+        return 1
+
+    def _op_swap_a(self, opcode: int) -> int:
+        """SWAP A"""
+        a = self.A
+        self.A = ((a << 4) | (a >> 4)) & 0xFF
+        return 1
+
+    def _op_xch_a_direct(self, opcode: int) -> int:
+        """XCH A, direct"""
+        addr = self.fetch()
+        tmp = self.A
+        self.A = self.get_direct(addr)
+        self.set_direct(addr, tmp)
+        return 1
+
+    def _op_xch_a_at_r0(self, opcode: int) -> int:
+        """XCH A, @R0"""
+        ptr = self.get_reg(0)
+        tmp = self.A
+        self.A = self.read_idata(ptr)
+        self.write_idata(ptr, tmp)
+        return 1
+
+    def _op_xch_a_at_r1(self, opcode: int) -> int:
+        """XCH A, @R1"""
+        ptr = self.get_reg(1)
+        tmp = self.A
+        self.A = self.read_idata(ptr)
+        self.write_idata(ptr, tmp)
+        return 1
+
+    def _op_xch_a_rn(self, opcode: int) -> int:
+        """XCH A, R0-R7"""
+        n = opcode & 0x07
+        tmp = self.A
+        self.A = self.get_reg(n)
+        self.set_reg(n, tmp)
+        return 1
+
+    def _op_pop_direct(self, opcode: int) -> int:
+        """POP direct"""
+        addr = self.fetch()
+        self.set_direct(addr, self.pop())
+        return 2
+
+    def _op_setb_bit(self, opcode: int) -> int:
+        """SETB bit"""
+        bit = self.fetch()
+        self.write_bit(bit, True)
+        return 1
+
+    def _op_setb_c(self, opcode: int) -> int:
+        """SETB C"""
+        self.CY = True
+        return 1
+
+    def _op_da_a(self, opcode: int) -> int:
+        """DA A (Decimal Adjust)"""
+        a = self.A
+        cy = self.CY
+
+        if (a & 0x0F) > 9 or self.AC:
+            a += 6
+            if a > 0xFF:
+                cy = True
+                a &= 0xFF
+
+        if (a >> 4) > 9 or cy:
+            a += 0x60
+            if a > 0xFF:
+                cy = True
+                a &= 0xFF
+
+        self.A = a
+        self.CY = cy
+        return 1
+
+    def _op_djnz_direct_rel(self, opcode: int) -> int:
+        """DJNZ direct, rel"""
+        addr = self.fetch()
+        rel = self.fetch()
+        val = (self.get_direct(addr) - 1) & 0xFF
+        self.set_direct(addr, val)
+        if val != 0:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_xchd_a_at_r0(self, opcode: int) -> int:
+        """XCHD A, @R0"""
+        ptr = self.get_reg(0)
+        val = self.read_idata(ptr)
+        self.write_idata(ptr, (val & 0xF0) | (self.A & 0x0F))
+        self.A = (self.A & 0xF0) | (val & 0x0F)
+        return 1
+
+    def _op_xchd_a_at_r1(self, opcode: int) -> int:
+        """XCHD A, @R1"""
+        ptr = self.get_reg(1)
+        val = self.read_idata(ptr)
+        self.write_idata(ptr, (val & 0xF0) | (self.A & 0x0F))
+        self.A = (self.A & 0xF0) | (val & 0x0F)
+        return 1
+
+    def _op_djnz_rn_rel(self, opcode: int) -> int:
+        """DJNZ R0-R7, rel"""
+        rel = self.fetch()
+        n = opcode & 0x07
+        val = (self.get_reg(n) - 1) & 0xFF
+        self.set_reg(n, val)
+        if val != 0:
+            self.rel_jump(rel)
+        return 2
+
+    def _op_movx_a_at_dptr(self, opcode: int) -> int:
+        """MOVX A, @DPTR"""
+        self.A = self.read_xdata(self.DPTR)
+        return 2
+
+    def _op_movx_a_at_r0(self, opcode: int) -> int:
+        """MOVX A, @R0 (external with P2)"""
+        p2 = self.read_sfr(self.SFR_P2)
+        addr = (p2 << 8) | self.get_reg(0)
+        self.A = self.read_xdata(addr)
+        return 2
+
+    def _op_movx_a_at_r1(self, opcode: int) -> int:
+        """MOVX A, @R1 (external with P2)"""
+        p2 = self.read_sfr(self.SFR_P2)
+        addr = (p2 << 8) | self.get_reg(1)
+        self.A = self.read_xdata(addr)
+        return 2
+
+    def _op_clr_a(self, opcode: int) -> int:
+        """CLR A"""
+        self.A = 0
+        return 1
+
+    def _op_mov_a_direct(self, opcode: int) -> int:
+        """MOV A, direct"""
+        addr = self.fetch()
+        self.A = self.get_direct(addr)
+        return 1
+
+    def _op_mov_a_at_r0(self, opcode: int) -> int:
+        """MOV A, @R0"""
+        self.A = self.read_idata(self.get_reg(0))
+        return 1
+
+    def _op_mov_a_at_r1(self, opcode: int) -> int:
+        """MOV A, @R1"""
+        self.A = self.read_idata(self.get_reg(1))
+        return 1
+
+    def _op_mov_a_rn(self, opcode: int) -> int:
+        """MOV A, R0-R7"""
+        self.A = self.get_reg(opcode & 0x07)
+        return 1
+
+    def _op_movx_at_dptr_a(self, opcode: int) -> int:
+        """MOVX @DPTR, A"""
+        self.write_xdata(self.DPTR, self.A)
+        return 2
+
+    def _op_movx_at_r0_a(self, opcode: int) -> int:
+        """MOVX @R0, A (external with P2)"""
+        p2 = self.read_sfr(self.SFR_P2)
+        addr = (p2 << 8) | self.get_reg(0)
+        self.write_xdata(addr, self.A)
+        return 2
+
+    def _op_movx_at_r1_a(self, opcode: int) -> int:
+        """MOVX @R1, A (external with P2)"""
+        p2 = self.read_sfr(self.SFR_P2)
+        addr = (p2 << 8) | self.get_reg(1)
+        self.write_xdata(addr, self.A)
+        return 2
+
+    def _op_cpl_a(self, opcode: int) -> int:
+        """CPL A - complement accumulator"""
+        self.A = (~self.A) & 0xFF
+        return 1
+
+    def _op_mov_direct_a(self, opcode: int) -> int:
+        """MOV direct, A"""
+        addr = self.fetch()
+        self.set_direct(addr, self.A)
+        return 1
+
+    def _op_mov_at_r0_a(self, opcode: int) -> int:
+        """MOV @R0, A"""
+        self.write_idata(self.get_reg(0), self.A)
+        return 1
+
+    def _op_mov_at_r1_a(self, opcode: int) -> int:
+        """MOV @R1, A"""
+        self.write_idata(self.get_reg(1), self.A)
+        return 1
+
+    def _op_mov_rn_a(self, opcode: int) -> int:
+        """MOV R0-R7, A"""
+        self.set_reg(opcode & 0x07, self.A)
+        return 1
 
     def _add(self, value: int, with_carry: bool):
         """ADD/ADDC helper - adds value to A with flags."""
@@ -1188,3 +1254,160 @@ class CPU8051:
         self.halted = False
         self.in_interrupt = False
         self.interrupt_pending.clear()
+
+
+def _build_opcode_table() -> tuple:
+    """Build the opcode -> handler table used by CPU8051.execute."""
+    table = [None] * 256
+    table[0x00] = CPU8051._op_nop
+    for op in range(0x01, 0x100, 0x20):
+        table[op] = CPU8051._op_ajmp_addr11
+    table[0x02] = CPU8051._op_ljmp_addr16
+    table[0x03] = CPU8051._op_rr_a
+    table[0x04] = CPU8051._op_inc_a
+    table[0x05] = CPU8051._op_inc_direct
+    table[0x06] = CPU8051._op_inc_at_r0
+    table[0x07] = CPU8051._op_inc_at_r1
+    for op in range(0x08, 0x10):
+        table[op] = CPU8051._op_inc_rn
+    table[0x10] = CPU8051._op_jbc_bit_rel
+    for op in range(0x11, 0x100, 0x20):
+        table[op] = CPU8051._op_acall_addr11
+    table[0x12] = CPU8051._op_lcall_addr16
+    table[0x13] = CPU8051._op_rrc_a
+    table[0x14] = CPU8051._op_dec_a
+    table[0x15] = CPU8051._op_dec_direct
+    table[0x16] = CPU8051._op_dec_at_r0
+    table[0x17] = CPU8051._op_dec_at_r1
+    for op in range(0x18, 0x20):
+        table[op] = CPU8051._op_dec_rn
+    table[0x20] = CPU8051._op_jb_bit_rel
+    table[0x22] = CPU8051._op_ret
+    table[0x23] = CPU8051._op_rl_a
+    table[0x24] = CPU8051._op_add_a_imm
+    table[0x25] = CPU8051._op_add_a_direct
+    table[0x26] = CPU8051._op_add_a_at_r0
+    table[0x27] = CPU8051._op_add_a_at_r1
+    for op in range(0x28, 0x30):
+        table[op] = CPU8051._op_add_a_rn
+    table[0x30] = CPU8051._op_jnb_bit_rel
+    table[0x32] = CPU8051._op_reti
+    table[0x33] = CPU8051._op_rlc_a
+    table[0x34] = CPU8051._op_addc_a_imm
+    table[0x35] = CPU8051._op_addc_a_direct
+    table[0x36] = CPU8051._op_addc_a_at_r0
+    table[0x37] = CPU8051._op_addc_a_at_r1
+    for op in range(0x38, 0x40):
+        table[op] = CPU8051._op_addc_a_rn
+    table[0x40] = CPU8051._op_jc_rel
+    table[0x42] = CPU8051._op_orl_direct_a
+    table[0x43] = CPU8051._op_orl_direct_imm
+    table[0x44] = CPU8051._op_orl_a_imm
+    table[0x45] = CPU8051._op_orl_a_direct
+    table[0x46] = CPU8051._op_orl_a_at_r0
+    table[0x47] = CPU8051._op_orl_a_at_r1
+    for op in range(0x48, 0x50):
+        table[op] = CPU8051._op_orl_a_rn
+    table[0x50] = CPU8051._op_jnc_rel
+    table[0x52] = CPU8051._op_anl_direct_a
+    table[0x53] = CPU8051._op_anl_direct_imm
+    table[0x54] = CPU8051._op_anl_a_imm
+    table[0x55] = CPU8051._op_anl_a_direct
+    table[0x56] = CPU8051._op_anl_a_at_r0
+    table[0x57] = CPU8051._op_anl_a_at_r1
+    for op in range(0x58, 0x60):
+        table[op] = CPU8051._op_anl_a_rn
+    table[0x60] = CPU8051._op_jz_rel
+    table[0x62] = CPU8051._op_xrl_direct_a
+    table[0x63] = CPU8051._op_xrl_direct_imm
+    table[0x64] = CPU8051._op_xrl_a_imm
+    table[0x65] = CPU8051._op_xrl_a_direct
+    table[0x66] = CPU8051._op_xrl_a_at_r0
+    table[0x67] = CPU8051._op_xrl_a_at_r1
+    for op in range(0x68, 0x70):
+        table[op] = CPU8051._op_xrl_a_rn
+    table[0x70] = CPU8051._op_jnz_rel
+    table[0x72] = CPU8051._op_orl_c_bit
+    table[0x73] = CPU8051._op_jmp_a_dptr
+    table[0x74] = CPU8051._op_mov_a_imm
+    table[0x75] = CPU8051._op_mov_direct_imm
+    table[0x76] = CPU8051._op_mov_at_r0_imm
+    table[0x77] = CPU8051._op_mov_at_r1_imm
+    for op in range(0x78, 0x80):
+        table[op] = CPU8051._op_mov_rn_imm
+    table[0x80] = CPU8051._op_sjmp_rel
+    table[0x82] = CPU8051._op_anl_c_bit
+    table[0x83] = CPU8051._op_movc_a_a_pc
+    table[0x84] = CPU8051._op_div_ab
+    table[0x85] = CPU8051._op_mov_direct_direct
+    table[0x86] = CPU8051._op_mov_direct_at_r0
+    table[0x87] = CPU8051._op_mov_direct_at_r1
+    for op in range(0x88, 0x90):
+        table[op] = CPU8051._op_mov_direct_rn
+    table[0x90] = CPU8051._op_mov_dptr_imm16
+    table[0x92] = CPU8051._op_mov_bit_c
+    table[0x93] = CPU8051._op_movc_a_a_dptr
+    table[0x94] = CPU8051._op_subb_a_imm
+    table[0x95] = CPU8051._op_subb_a_direct
+    table[0x96] = CPU8051._op_subb_a_at_r0
+    table[0x97] = CPU8051._op_subb_a_at_r1
+    for op in range(0x98, 0xA0):
+        table[op] = CPU8051._op_subb_a_rn
+    table[0xA0] = CPU8051._op_orl_c_nbit
+    table[0xA2] = CPU8051._op_mov_c_bit
+    table[0xA3] = CPU8051._op_inc_dptr
+    table[0xA4] = CPU8051._op_mul_ab
+    table[0xA5] = CPU8051._op_reserved
+    table[0xA6] = CPU8051._op_mov_at_r0_direct
+    table[0xA7] = CPU8051._op_mov_at_r1_direct
+    for op in range(0xA8, 0xB0):
+        table[op] = CPU8051._op_mov_rn_direct
+    table[0xB0] = CPU8051._op_anl_c_nbit
+    table[0xB2] = CPU8051._op_cpl_bit
+    table[0xB3] = CPU8051._op_cpl_c
+    table[0xB4] = CPU8051._op_cjne_a_imm_rel
+    table[0xB5] = CPU8051._op_cjne_a_direct_rel
+    table[0xB6] = CPU8051._op_cjne_at_r0_imm_rel
+    table[0xB7] = CPU8051._op_cjne_at_r1_imm_rel
+    for op in range(0xB8, 0xC0):
+        table[op] = CPU8051._op_cjne_rn_imm_rel
+    table[0xC0] = CPU8051._op_push_direct
+    table[0xC2] = CPU8051._op_clr_bit
+    table[0xC3] = CPU8051._op_clr_c
+    table[0xC4] = CPU8051._op_swap_a
+    table[0xC5] = CPU8051._op_xch_a_direct
+    table[0xC6] = CPU8051._op_xch_a_at_r0
+    table[0xC7] = CPU8051._op_xch_a_at_r1
+    for op in range(0xC8, 0xD0):
+        table[op] = CPU8051._op_xch_a_rn
+    table[0xD0] = CPU8051._op_pop_direct
+    table[0xD2] = CPU8051._op_setb_bit
+    table[0xD3] = CPU8051._op_setb_c
+    table[0xD4] = CPU8051._op_da_a
+    table[0xD5] = CPU8051._op_djnz_direct_rel
+    table[0xD6] = CPU8051._op_xchd_a_at_r0
+    table[0xD7] = CPU8051._op_xchd_a_at_r1
+    for op in range(0xD8, 0xE0):
+        table[op] = CPU8051._op_djnz_rn_rel
+    table[0xE0] = CPU8051._op_movx_a_at_dptr
+    table[0xE2] = CPU8051._op_movx_a_at_r0
+    table[0xE3] = CPU8051._op_movx_a_at_r1
+    table[0xE4] = CPU8051._op_clr_a
+    table[0xE5] = CPU8051._op_mov_a_direct
+    table[0xE6] = CPU8051._op_mov_a_at_r0
+    table[0xE7] = CPU8051._op_mov_a_at_r1
+    for op in range(0xE8, 0xF0):
+        table[op] = CPU8051._op_mov_a_rn
+    table[0xF0] = CPU8051._op_movx_at_dptr_a
+    table[0xF2] = CPU8051._op_movx_at_r0_a
+    table[0xF3] = CPU8051._op_movx_at_r1_a
+    table[0xF4] = CPU8051._op_cpl_a
+    table[0xF5] = CPU8051._op_mov_direct_a
+    table[0xF6] = CPU8051._op_mov_at_r0_a
+    table[0xF7] = CPU8051._op_mov_at_r1_a
+    for op in range(0xF8, 0x100):
+        table[op] = CPU8051._op_mov_rn_a
+    return tuple(table)
+
+
+_OPCODE_TABLE = _build_opcode_table()
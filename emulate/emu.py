@@ -18,23 +18,227 @@ Options:
 import sys
 import os
 import argparse
+import mmap
 import threading
 import time
+from array import array
+from functools import lru_cache
 from pathlib import Path
 
 # Add emulate directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from cpu import CPU8051
+from cpu import CPU8051, AddressBitmap
 from memory import Memory, MemoryMap
 from peripherals import Peripherals
 from hardware import HardwareState, create_hardware_hooks
 from disasm8051 import INSTRUCTIONS
 
+# Opcode -> instruction length in bytes (unknown opcodes are 1 byte).
+# Generated by scripts/gen_inst_len.py from disasm8051.INSTRUCTIONS.
+_INST_LEN = bytes.fromhex(
+    '0102030101020101010101010101010103020301010201010101010101010101'
+    '0302010102020101010101010101010103020101020201010101010101010101'
+    '0202020302020101010101010101010102020203020201010101010101010101'
+    '0202020302020101010101010101010102020201020302020202020202020202'
+    '0202020101030202020202020202020203020201020201010101010101010101'
+    '0202020101010202020202020202020202020201030303030303030303030303'
+    '0202020101020101010101010101010102020201010301010202020202020202'
+    '0102010101020101010101010101010101020101010201010101010101010101'
+)
+
+# INSTRUCTIONS with mnemonics upper-cased once, as trace output shows them
+_INSTR = {op: (m.upper(), size, fmt) for op, (m, size, fmt) in INSTRUCTIONS.items()}
+
+# Opcode -> finished trace text for operand-less instructions, else None.
+_NO_OPERAND_TEXT = tuple(
+    _INSTR[op][0] if op in _INSTR and _INSTR[op][2] is None else None
+    for op in range(256)
+)
+
+
+def _rel(b: int) -> int:
+    """Sign-extend an 8-bit relative offset."""
+    return b if b < 128 else b - 256
+
+
+def _fmt_default(m, o, op):
+    """Default: just show mnemonic with hex operands."""
+    operand_str = ','.join(f"{b:02X}h" for b in o)
+    return f"{m} {operand_str}"
+
+
+# Operand formats rendered verbatim (no extra bytes)
+_VERBATIM_FMTS = frozenset((
+    'A', 'C', 'AB', 'DPTR', '@A+DPTR', '@A+PC',
+    'R0', 'R1', 'R2', 'R3', 'R4', 'R5', 'R6', 'R7',
+    '@R0', '@R1', 'A,@R0', 'A,@R1', '@R0,A', '@R1,A',
+))
+
+# Formatters for operand formats that are matched exactly
+_EXACT_FORMATTERS = {
+    'DPTR,#data16': lambda m, o, op: f"{m} DPTR,#{(o[0] << 8) | o[1]:04X}",
+    'A,#data': lambda m, o, op: f"{m} A,#{o[0]:02X}",
+    'A,direct': lambda m, o, op: f"{m} A,{o[0]:02X}h",
+    'direct': lambda m, o, op: f"{m} {o[0]:02X}h",
+    'direct,A': lambda m, o, op: f"{m} {o[0]:02X}h,A",
+    'direct,#data': lambda m, o, op: f"{m} {o[0]:02X}h,#{o[1]:02X}",
+    'direct,direct': lambda m, o, op: f"{m} {o[0]:02X}h,{o[1]:02X}h",
+    'direct,rel': lambda m, o, op: f"{m} {o[0]:02X}h,{_rel(o[1]):+d}",
+    'addr16': lambda m, o, op: f"{m} {(o[0] << 8) | o[1]:04X}h",
+    'addr11': lambda m, o, op: f"{m} {(((op >> 5) & 0x07) << 8) | o[0]:03X}h",
+    'rel': lambda m, o, op: f"{m} {_rel(o[0]):+d}",
+    'bit': lambda m, o, op: f"{m} {o[0]:02X}h",
+    'bit,C': lambda m, o, op: f"{m} {o[0]:02X}h,C",
+    'C,bit': lambda m, o, op: f"{m} C,{o[0]:02X}h",
+    'C,/bit': lambda m, o, op: f"{m} C,/{o[0]:02X}h",
+    'bit,rel': lambda m, o, op: f"{m} {o[0]:02X}h,{_rel(o[1]):+d}",
+    'A,#data,rel': lambda m, o, op: f"{m} A,#{o[0]:02X},{_rel(o[1]):+d}",
+    'A,direct,rel': lambda m, o, op: f"{m} A,{o[0]:02X}h,{_rel(o[1]):+d}",
+}
+
+
+def _make_formatter(operand_fmt: str):
+    """
+    Build the formatter for one operand format.
+
+    Pattern formats (direct,Rn / Rn,#data / ...) are resolved once here
+    rather than re-matched on every call. Register formats that take a
+    relative offset after an immediate (CJNE Rn,#data,rel) keep the generic
+    hex rendering, as before.
+    """
+    if operand_fmt in _VERBATIM_FMTS:
+        text = operand_fmt.upper()
+        return lambda m, o, op: f"{m} {text}"
+    if operand_fmt in _EXACT_FORMATTERS:
+        return _EXACT_FORMATTERS[operand_fmt]
+    if operand_fmt.startswith(('direct,R', 'direct,@R')):
+        reg = operand_fmt.split(',')[1]
+        return lambda m, o, op: f"{m} {o[0]:02X}h,{reg}"
+    if operand_fmt.startswith(('R', '@R')) and ',' in operand_fmt:
+        reg, rest = operand_fmt.split(',', 1)
+        if rest == '#data':
+            return lambda m, o, op: f"{m} {reg},#{o[0]:02X}"
+        if rest == 'direct':
+            return lambda m, o, op: f"{m} {reg},{o[0]:02X}h"
+        if rest == 'rel':
+            return lambda m, o, op: f"{m} {reg},{_rel(o[0]):+d}"
+        return _fmt_default
+    if operand_fmt.endswith(',#data,rel'):
+        reg = operand_fmt.split(',')[0]
+        return lambda m, o, op: f"{m} {reg},#{o[0]:02X},{_rel(o[1]):+d}"
+    return _fmt_default
+
+
+# Operand format -> formatter(mnemonic_upper, operand_bytes, opcode)
+_OPERAND_FORMATTERS = {
+    operand_fmt: _make_formatter(operand_fmt)
+    for _, _, operand_fmt in INSTRUCTIONS.values()
+    if operand_fmt is not None
+}
+
+# Opcode -> operand formatter (None for unknown or operand-less opcodes)
+_OPCODE_FORMATTERS = tuple(
+    _OPERAND_FORMATTERS[INSTRUCTIONS[op][2]]
+    if op in INSTRUCTIONS and INSTRUCTIONS[op][2] is not None else None
+    for op in range(256)
+)
+
+
+@lru_cache(maxsize=4096)
+def _disassemble_bytes(inst_bytes: bytes) -> str:
+    """
+    Disassemble one instruction for trace output.
+
+    Pure over its input, so results are memoized: traces of tight firmware
+    loops format the same byte patterns over and over.
+    """
+    opcode = inst_bytes[0]
+    text = _NO_OPERAND_TEXT[opcode]
+    if text is not None:
+        return text
+
+    # Use full instruction table from disasm8051
+    entry = _INSTR.get(opcode)
+    if entry is None:
+        return f"??? ({opcode:02X})"
+
+    mnemonic, size, _ = entry
+
+    # Check we have enough bytes
+    if len(inst_bytes) < size:
+        return f"??? ({opcode:02X})"
+
+    # Format operands
+    return _OPCODE_FORMATTERS[opcode](mnemonic, inst_bytes[1:size], opcode)
+
+# Untraced run loop, specialized per (limit, pc_stats) by _get_run_loop().
+# Disabled features are left out of the generated bytecode entirely.
+# Instructions are counted in a local and folded into inst_count on exit,
+# together with last_pc.
+_RUN_LOOP_TEMPLATE = """
+def run_loop(self, max_cycles, max_instructions):
+    cpu = self.cpu
+    cpu_step = cpu.step
+    tick = self.hw.tick
+    pc_stats = self.pc_stats
+    n = 0
+    {init}
+    try:
+        while {cond}:
+            if cpu.halted:
+                return None
+            pc = cpu.pc
+            {stats}
+            cycles = cpu_step()
+            n += 1
+            tick(cycles, cpu)
+            if cpu.halted:
+                return None
+        return {reason}
+    finally:
+        if n:
+            self.inst_count += n
+            self.last_pc = pc
+"""
+
+# limit -> (init, loop condition, stop reason)
+_RUN_LOOP_LIMITS = {
+    'cycles': ('', 'cpu.cycles < max_cycles', '"max_cycles"'),
+    'instructions': ('remaining = max_instructions - self.inst_count',
+                     'n < remaining', '"max_instructions"'),
+    None: ('', 'True', 'None'),
+}
+
+_RUN_LOOPS = {}
+
+# Stand-in bound for an unset cycle/instruction limit
+_NO_LIMIT = 1 << 62
+
+
+def _get_run_loop(limit, pc_stats: bool):
+    """Return the generated run loop for a limit kind and pc_stats setting."""
+    key = (limit, pc_stats)
+    loop = _RUN_LOOPS.get(key)
+    if loop is None:
+        init, cond, reason = _RUN_LOOP_LIMITS[limit]
+        src = _RUN_LOOP_TEMPLATE.format(
+            init=init, cond=cond, reason=reason,
+            stats='pc_stats[pc] += 1' if pc_stats else '')
+        namespace = {}
+        exec(compile(src, f"<run_loop limit={limit} pc_stats={pc_stats}>", 'exec'), namespace)
+        loop = _RUN_LOOPS[key] = namespace['run_loop']
+    return loop
+
 
 class Emulator:
     """ASM2464PD Firmware Emulator."""
 
+    __slots__ = ('memory', 'cpu', 'hw', '_pre_hook', 'inst_count',
+                 'last_pc', 'trace_pcs', 'trace_pc_hits', 'watch_addrs', '_watch_meta',
+                 '_watch_read_hook', '_watch_write_hook', 'pc_stats',
+                 'usb_device', 'usb_thread', 'usb_running')
+
     def __init__(self, trace: bool = False, log_hw: bool = False,
                  log_uart: bool = True, usb_delay: int = 200000):
         self.memory = Memory()
@@ -48,7 +252,6 @@ class Emulator:
             write_sfr=self.memory.write_sfr,
             read_bit=self.memory.read_bit,
             write_bit=self.memory.write_bit,
-            trace=trace,
         )
 
         # Hardware emulation (replaces simple stubs)
@@ -59,31 +262,49 @@ class Emulator:
         # Store CPU reference for PC tracing in hardware callbacks
         self.hw._cpu_ref = self.cpu
 
+        # Per-instruction trace hook; None when tracing is off (see trace property)
+        self._pre_hook = self._trace_instruction if trace else None
+
         # Statistics
         self.inst_count = 0
         self.last_pc = 0
 
         # Debugging: PC trace addresses (set via --trace-pc)
-        self.trace_pcs = set()
+        self.trace_pcs = AddressBitmap()
         self.trace_pc_hits = {}  # Count hits per address
 
         # Debugging: Watch XDATA addresses
-        self.watch_addrs = set()
+        self.watch_addrs = AddressBitmap()
+        self._watch_meta = {}  # addr -> (name, orig_read, orig_write)
+        self._watch_read_hook = self._watch_read  # Bound once, shared by all addrs
+        self._watch_write_hook = self._watch_write
 
         # Debugging: PC hit statistics (for analysis)
-        self.pc_stats = {}  # PC -> hit count
+        self.pc_stats = array('Q', [0]) * 0x10000  # PC -> hit count (None disables)
 
         # USB device emulation
         self.usb_device = None
         self.usb_thread = None
         self.usb_running = False
 
+    @property
+    def trace(self) -> bool:
+        """Full instruction tracing enabled."""
+        return self._pre_hook is not None
+
+    @trace.setter
+    def trace(self, enabled: bool):
+        self._pre_hook = self._trace_instruction if enabled else None
+
     def load_firmware(self, path: str):
         """Load firmware binary."""
         with open(path, 'rb') as f:
-            data = f.read()
-        print(f"Loaded {len(data)} bytes from {path}")
-        self.memory.load_firmware(data)
+            size = os.fstat(f.fileno()).st_size
+            if size:
+                # Map the file read-only so the image is copied only once
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self.memory.load_firmware(mm)
+        print(f"Loaded {size} bytes from {path}")
         # Load USB3 config descriptor from ROM and fix wTotalLength
         self.hw.load_config_descriptor_from_rom()
 
@@ -98,32 +319,42 @@ class Emulator:
 
     def step(self) -> bool:
         """Execute one instruction. Returns False if halted."""
-        if self.cpu.halted:
+        cpu = self.cpu
+        hw = self.hw
+        if cpu.halted:
             return False
 
-        self.last_pc = self.cpu.pc
-        pc = self.cpu.pc
+        pc = cpu.pc
+        self.last_pc = pc
 
         # Track PC hit for statistics
-        if self.pc_stats is not None:
-            self.pc_stats[pc] = self.pc_stats.get(pc, 0) + 1
+        pc_stats = self.pc_stats
+        if pc_stats is not None:
+            pc_stats[pc] += 1
+
+        # One combined test for every debug feature; the checks live in _debug_step
+        if self._pre_hook is not None or self.trace_pcs.count or hw.trace_enabled:
+            self._debug_step(pc)
 
-        # Check for trace PC addresses
-        if pc in self.trace_pcs:
+        cycles = cpu.step()
+        self.inst_count += 1
+        hw.tick(cycles, cpu)
+
+        return not self.cpu.halted
+
+    def _debug_step(self, pc: int):
+        """Run trace-PC, hardware trace point and instruction trace hooks for pc."""
+        # Check for trace PC addresses (inline bitmap test)
+        if self.trace_pcs.bits[pc >> 3] >> (pc & 7) & 1:
             self.trace_pc_hits[pc] = self.trace_pc_hits.get(pc, 0) + 1
             self._trace_pc_hit(pc)
 
         # Check hardware trace points
         self.hw.check_trace(pc)
 
-        if self.cpu.trace:
-            self._trace_instruction()
-
-        cycles = self.cpu.step()
-        self.inst_count += 1
-        self.hw.tick(cycles, self.cpu)
-
-        return not self.cpu.halted
+        pre_hook = self._pre_hook
+        if pre_hook is not None:
+            pre_hook()
 
     def _trace_pc_hit(self, pc: int):
         """Log when a traced PC is hit."""
@@ -131,19 +362,14 @@ class Emulator:
         hit_count = self.trace_pc_hits[pc]
 
         # Get instruction for context
-        opcode = self.memory.read_code(pc)
-        inst_bytes = [opcode]
-        inst_len = self._get_inst_length(opcode)
-        for i in range(1, inst_len):
-            inst_bytes.append(self.memory.read_code((pc + i) & 0xFFFF))
-        mnemonic = self._disassemble(inst_bytes)
+        _, mnemonic = self._decode(pc)
 
         # Show CPU state
         a = self.cpu.A
         r7 = self.memory.read_idata(7)
 
-        print(f"[{self.hw.cycles:8d}] PC=0x{pc:04X} bank={bank} hit#{hit_count} "
-              f"{mnemonic} A=0x{a:02X} R7=0x{r7:02X}")
+        self._log(f"[{self.hw.cycles:8d}] PC=0x{pc:04X} bank={bank} hit#{hit_count} "
+                  f"{mnemonic} A=0x{a:02X} R7=0x{r7:02X}")
 
     def setup_watch(self, addr: int, name: str = None):
         """
@@ -153,65 +379,127 @@ class Emulator:
             addr: XDATA address to watch
             name: Optional name for the address (for logging)
         """
+        addr &= 0xFFFF
         self.watch_addrs.add(addr)
         watch_name = name or f"0x{addr:04X}"
 
-        # Create hooks that wrap existing functionality
+        # Re-watching only renames: the wrapped hooks stay the original ones
+        meta = self._watch_meta.get(addr)
+        if meta is not None:
+            self._watch_meta[addr] = (watch_name, meta[1], meta[2])
+            return
+
+        # Wrap existing functionality; one shared read/write hook pair serves
+        # every watched address by looking up its entry in _watch_meta
         orig_read = self.memory.xdata_read_hooks.get(addr)
         orig_write = self.memory.xdata_write_hooks.get(addr)
-
-        emu = self  # Capture reference
-
-        def watch_read(a):
-            val = orig_read(a) if orig_read else emu.memory.xdata[a]
-            pc = emu.cpu.pc
-            print(f"[{emu.hw.cycles:8d}] READ  {watch_name} = 0x{val:02X} (PC=0x{pc:04X})")
-            return val
-
-        def watch_write(a, v):
-            pc = emu.cpu.pc
-            old_val = emu.memory.xdata[a]
-            print(f"[{emu.hw.cycles:8d}] WRITE {watch_name} = 0x{v:02X} (was 0x{old_val:02X}, PC=0x{pc:04X})")
-            if orig_write:
-                orig_write(a, v)
-            else:
-                emu.memory.xdata[a] = v
-
-        self.memory.xdata_read_hooks[addr] = watch_read
-        self.memory.xdata_write_hooks[addr] = watch_write
+        # MMIO addresses forward to the current hw accessor, so accessors
+        # replacing hw.read/hw.write later still see watched traffic
+        if orig_read is self.hw.read:
+            orig_read = self._hw_read
+        if orig_write is self.hw.write:
+            orig_write = self._hw_write
+        self._watch_meta[addr] = (watch_name, orig_read, orig_write)
+
+        self.memory.xdata_read_hooks[addr] = self._watch_read_hook
+        self.memory.xdata_write_hooks[addr] = self._watch_write_hook
+
+    def _hw_read(self, a: int) -> int:
+        """Forward a watched MMIO read to the installed hw.read."""
+        return self.hw.read(a)
+
+    def _hw_write(self, a: int, v: int):
+        """Forward a watched MMIO write to the installed hw.write."""
+        self.hw.write(a, v)
+
+    def _watch_read(self, a: int) -> int:
+        """XDATA read hook for watched addresses."""
+        watch_name, orig_read, _ = self._watch_meta[a]
+        val = orig_read(a) if orig_read else self.memory.xdata[a]
+        self._log(f"[{self.hw.cycles:8d}] READ  {watch_name} = 0x{val:02X} (PC=0x{self.cpu.pc:04X})")
+        return val
+
+    def _watch_write(self, a: int, v: int):
+        """XDATA write hook for watched addresses."""
+        watch_name, _, orig_write = self._watch_meta[a]
+        old_val = self.memory.xdata[a]
+        self._log(f"[{self.hw.cycles:8d}] WRITE {watch_name} = 0x{v:02X} "
+                  f"(was 0x{old_val:02X}, PC=0x{self.cpu.pc:04X})")
+        if orig_write:
+            orig_write(a, v)
+        else:
+            self.memory.xdata[a] = v
 
     def run(self, max_cycles: int = None, max_instructions: int = None) -> str:
         """
         Run emulator until halt, breakpoint, or limit reached.
 
+        The loop is picked once per call by _pick_run_impl(), so the hot
+        path only tests the limits and debug hooks that are actually in use.
+
         Returns reason for stopping.
         """
+        run_impl = self._pick_run_impl(max_cycles, max_instructions)
+        try:
+            reason = run_impl(max_cycles, max_instructions)
+        finally:
+            self.flush_log()
+        if reason is None:
+            cpu = self.cpu
+            if cpu.pc in cpu.breakpoints:
+                return "breakpoint"
+            return "halted"
+        return reason
+
+    def _pick_run_impl(self, max_cycles: int = None, max_instructions: int = None):
+        """Select the run loop specialized for the active limits and tracing."""
+        tracing = self._pre_hook is not None or self.trace_pcs or self.hw.trace_enabled
+        if tracing or (max_cycles and max_instructions):
+            return self._run_checked
+        if max_cycles:
+            limit = 'cycles'
+        elif max_instructions:
+            limit = 'instructions'
+        else:
+            limit = None
+        return _get_run_loop(limit, self.pc_stats is not None).__get__(self)
+
+    def _run_checked(self, max_cycles: int = None, max_instructions: int = None):
+        """Generic run loop: every limit and trace hook is checked per step."""
+        cpu = self.cpu
+        step = self.step
+        # Unset limits become unreachable bounds: one compare per check
+        max_cycles = max_cycles or _NO_LIMIT
+        max_instructions = max_instructions or _NO_LIMIT
         while True:
-            if max_cycles and self.cpu.cycles >= max_cycles:
+            if cpu.cycles >= max_cycles:
                 return "max_cycles"
-            if max_instructions and self.inst_count >= max_instructions:
+            if self.inst_count >= max_instructions:
                 return "max_instructions"
 
-            if not self.step():
-                if self.cpu.pc in self.cpu.breakpoints:
-                    return "breakpoint"
-                return "halted"
+            if not step():
+                return None
+
+    def _log(self, line: str):
+        """Write a trace/watch line to stdout without flushing.
+
+        Lines go straight to sys.stdout so they stay in order with the
+        [HW], [USB] and [UART] prints. stdout is already block-buffered
+        when it is not a TTY, and flush_log() flushes it at the end of run().
+        """
+        sys.stdout.write(line + '\n')
+
+    def flush_log(self):
+        """Flush trace/watch output and raw UART characters to stdout."""
+        sys.stdout.flush()
 
     def _trace_instruction(self):
         """Print trace of current instruction."""
         pc = self.cpu.pc
         bank = self.memory.read_sfr(0x96) & 1
-        opcode = self.memory.read_code(pc)
-
-        # Get instruction bytes
-        inst_bytes = [opcode]
-        inst_len = self._get_inst_length(opcode)
-        for i in range(1, inst_len):
-            inst_bytes.append(self.memory.read_code((pc + i) & 0xFFFF))
 
         # Format instruction
-        hex_bytes = ' '.join(f'{b:02X}' for b in inst_bytes)
-        mnemonic = self._disassemble(inst_bytes)
+        hex_bytes, mnemonic = self._decode(pc)
 
         # CPU state
         a = self.cpu.A
@@ -219,141 +507,32 @@ class Emulator:
         sp = self.cpu.SP
         dptr = self.cpu.DPTR
 
-        print(f"[{bank}] {pc:04X}: {hex_bytes:12s} {mnemonic:20s} "
-              f"A={a:02X} PSW={psw:02X} SP={sp:02X} DPTR={dptr:04X}")
+        self._log(f"[{bank}] {pc:04X}: {hex_bytes:12s} {mnemonic:20s} "
+                  f"A={a:02X} PSW={psw:02X} SP={sp:02X} DPTR={dptr:04X}")
+
+    def _decode(self, pc: int):
+        """
+        Decode the instruction at pc for trace output.
+
+        Returns (hex_bytes, mnemonic). The bytes are fetched on every call,
+        since code memory can be patched at runtime; formatting is memoized
+        on the bytes themselves by _disassemble_bytes().
+        """
+        opcode = self.memory.read_code(pc)
+        inst_bytes = self.memory.read_code_block(pc, _INST_LEN[opcode])
+        return inst_bytes.hex(' ').upper(), _disassemble_bytes(inst_bytes)
 
     def _get_inst_length(self, opcode: int) -> int:
         """Get instruction length in bytes using instruction table."""
-        if opcode in INSTRUCTIONS:
-            return INSTRUCTIONS[opcode][1]  # Size is second element of tuple
-        return 1  # Default for unknown opcodes
+        return _INST_LEN[opcode & 0xFF]
 
-    def _disassemble(self, inst_bytes: list) -> str:
+    def _disassemble(self, inst_bytes: bytes) -> str:
         """Simple disassembler for trace output using full instruction set."""
-        opcode = inst_bytes[0]
-
-        # Use full instruction table from disasm8051
-        if opcode not in INSTRUCTIONS:
-            return f"??? ({opcode:02X})"
-
-        mnemonic, size, operand_fmt = INSTRUCTIONS[opcode]
-
-        # Check we have enough bytes
-        if len(inst_bytes) < size:
-            return f"??? ({opcode:02X})"
-
-        # Format operands
-        if operand_fmt is None:
-            return mnemonic.upper()
-
-        # Get operand bytes
-        operands = inst_bytes[1:size]
-
-        # Handle specific operand formats
-        if operand_fmt == 'A':
-            return f"{mnemonic.upper()} A"
-        elif operand_fmt == 'C':
-            return f"{mnemonic.upper()} C"
-        elif operand_fmt == 'AB':
-            return f"{mnemonic.upper()} AB"
-        elif operand_fmt == 'DPTR':
-            return f"{mnemonic.upper()} DPTR"
-        elif operand_fmt == '@A+DPTR':
-            return f"{mnemonic.upper()} @A+DPTR"
-        elif operand_fmt == '@A+PC':
-            return f"{mnemonic.upper()} @A+PC"
-
-        # Register operands (no extra bytes)
-        elif operand_fmt in ('R0', 'R1', 'R2', 'R3', 'R4', 'R5', 'R6', 'R7',
-                             '@R0', '@R1', 'A,@R0', 'A,@R1', '@R0,A', '@R1,A'):
-            return f"{mnemonic.upper()} {operand_fmt.upper()}"
-
-        # DPTR with immediate 16-bit
-        elif operand_fmt == 'DPTR,#data16':
-            val = (operands[0] << 8) | operands[1]
-            return f"{mnemonic.upper()} DPTR,#{val:04X}"
-
-        # A with immediate byte
-        elif operand_fmt == 'A,#data':
-            return f"{mnemonic.upper()} A,#{operands[0]:02X}"
-        elif operand_fmt == 'A,direct':
-            return f"{mnemonic.upper()} A,{operands[0]:02X}h"
-
-        # Direct with various operands
-        elif operand_fmt == 'direct':
-            return f"{mnemonic.upper()} {operands[0]:02X}h"
-        elif operand_fmt == 'direct,A':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,A"
-        elif operand_fmt == 'direct,#data':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,#{operands[1]:02X}"
-        elif operand_fmt == 'direct,direct':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{operands[1]:02X}h"
-        elif operand_fmt.startswith('direct,R'):
-            reg = operand_fmt.split(',')[1]
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{reg}"
-        elif operand_fmt.startswith('direct,@R'):
-            reg = operand_fmt.split(',')[1]
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{reg}"
-        elif operand_fmt == 'direct,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{rel:+d}"
-
-        # Register with immediate or direct
-        elif ',' in operand_fmt and operand_fmt.startswith(('R', '@R')):
-            reg, rest = operand_fmt.split(',', 1)
-            if rest == '#data':
-                return f"{mnemonic.upper()} {reg},#{operands[0]:02X}"
-            elif rest == 'direct':
-                return f"{mnemonic.upper()} {reg},{operands[0]:02X}h"
-            elif rest == 'rel':
-                rel = operands[0] if operands[0] < 128 else operands[0] - 256
-                return f"{mnemonic.upper()} {reg},{rel:+d}"
-
-        # Addresses
-        elif operand_fmt == 'addr16':
-            addr = (operands[0] << 8) | operands[1]
-            return f"{mnemonic.upper()} {addr:04X}h"
-        elif operand_fmt == 'addr11':
-            high_bits = (opcode >> 5) & 0x07
-            addr = (high_bits << 8) | operands[0]
-            return f"{mnemonic.upper()} {addr:03X}h"
-
-        # Relative jumps
-        elif operand_fmt == 'rel':
-            rel = operands[0] if operands[0] < 128 else operands[0] - 256
-            return f"{mnemonic.upper()} {rel:+d}"
-
-        # Bit operations
-        elif operand_fmt == 'bit':
-            return f"{mnemonic.upper()} {operands[0]:02X}h"
-        elif operand_fmt == 'bit,C':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,C"
-        elif operand_fmt == 'C,bit':
-            return f"{mnemonic.upper()} C,{operands[0]:02X}h"
-        elif operand_fmt == 'C,/bit':
-            return f"{mnemonic.upper()} C,/{operands[0]:02X}h"
-        elif operand_fmt == 'bit,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{rel:+d}"
-
-        # CJNE variants
-        elif operand_fmt == 'A,#data,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} A,#{operands[0]:02X},{rel:+d}"
-        elif operand_fmt == 'A,direct,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} A,{operands[0]:02X}h,{rel:+d}"
-        elif operand_fmt.endswith(',#data,rel'):
-            reg = operand_fmt.split(',')[0]
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} {reg},#{operands[0]:02X},{rel:+d}"
-
-        # Default: just show mnemonic with hex operands
-        operand_str = ','.join(f"{b:02X}h" for b in operands)
-        return f"{mnemonic.upper()} {operand_str}"
+        return _disassemble_bytes(bytes(inst_bytes))
 
     def dump_state(self):
         """Print current CPU and memory state."""
+        self.flush_log()
         print("\n=== CPU State ===")
         print(f"PC: 0x{self.cpu.pc:04X}  Bank: {self.memory.read_sfr(0x96) & 1}")
         print(f"A:  0x{self.cpu.A:02X}  B: 0x{self.cpu.B:02X}")
@@ -363,20 +542,23 @@ class Emulator:
 
         # Register banks
         print("\nRegisters:")
+        regs = self.memory.idata[0:32]  # R0-R7 for all 4 banks
         for bank in range(4):
-            regs = [self.memory.read_idata(bank * 8 + i) for i in range(8)]
-            print(f"  Bank {bank}: " + ' '.join(f'{r:02X}' for r in regs))
+            print(f"  Bank {bank}: " + ' '.join(f'{r:02X}' for r in regs[bank * 8:bank * 8 + 8]))
 
         # Stack
         sp = self.cpu.SP
         if sp > 0x07:
             print(f"\nStack (SP=0x{sp:02X}):")
-            for i in range(min(8, sp - 0x07)):
-                addr = sp - i
-                print(f"  0x{addr:02X}: 0x{self.memory.read_idata(addr):02X}")
+            # Top 8 stack bytes (never below 0x08), printed from SP down
+            base = max(0x08, sp - 7)
+            stack = self.memory.idata[base:sp + 1]
+            for i in range(len(stack) - 1, -1, -1):
+                print(f"  0x{base + i:02X}: 0x{stack[i]:02X}")
 
     def dump_trace_stats(self):
         """Print trace PC hit statistics."""
+        self.flush_log()
         if self.trace_pc_hits:
             print("\n=== Trace PC Hits ===")
             for pc in sorted(self.trace_pc_hits.keys()):
@@ -388,7 +570,7 @@ class Emulator:
         print(f"\n=== XDATA 0x{start:04X}-0x{start+length-1:04X} ===")
         for offset in range(0, length, 16):
             addr = start + offset
-            hex_str = ' '.join(f'{self.memory.xdata[addr+i]:02X}' for i in range(min(16, length - offset)))
+            hex_str = self.memory.xdata[addr:addr + min(16, length - offset)].hex(' ').upper()
             print(f"  0x{addr:04X}: {hex_str}")
 
     def dump_registers(self, addrs: list):
@@ -535,8 +717,8 @@ Examples:
                         help='Watch XDATA address for reads/writes (hex), can repeat')
     parser.add_argument('--break', '-b', dest='breakpoints', action='append',
                         default=[], help='Set breakpoint at address (hex)')
-    parser.add_argument('--max-cycles', '-c', type=int, default=10000000,
-                        help='Maximum cycles to run (default: 10M)')
+    parser.add_argument('--max-cycles', '-c', type=int, default=None,
+                        help='Maximum cycles to run (default: no limit, stop with Ctrl-C)')
     parser.add_argument('--max-inst', '-i', type=int, default=None,
                         help='Maximum instructions to run')
     parser.add_argument('--dump', '-d', action='store_true',
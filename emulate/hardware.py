@@ -6,12 +6,165 @@ Only hardware registers (XDATA >= 0x6000) are emulated here.
 RAM (XDATA < 0x6000) is handled by the memory system, not this module.
 """
 
-from typing import TYPE_CHECKING, Dict, Set, Callable, Optional
+import sys
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, ClassVar, Dict, Set, Callable, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import IntEnum
 
+from memory import HookTable
+
 if TYPE_CHECKING:
     from memory import Memory
+    from cpu import CPU8051
+
+
+class RegisterFile(bytearray):
+    """
+    Flat 64KB hardware register image indexed by XDATA address.
+
+    Unwritten registers read as 0. get() keeps the dict-style lookup
+    that callers and tests use. `in` and iteration would work on byte
+    values rather than addresses, so they raise TypeError instead of
+    quietly answering a different question than the old dict did.
+    """
+
+    def get(self, addr: int, default: int = 0) -> int:
+        if 0 <= addr < len(self):
+            return self[addr]
+        return default
+
+    def __contains__(self, addr):
+        raise TypeError("RegisterFile has every address; test values with get()")
+
+    def __iter__(self):
+        raise TypeError("RegisterFile is not iterable; loop over an address range")
+
+
+# HardwareState.read/write accessors, generated per instance by
+# _get_mmio_factory(). The register tables never change identity after
+# __post_init__, so they are bound as closure variables instead of being
+# looked up on self per access. The log line is only emitted into the
+# variant built with logging enabled; see HardwareState.set_logging().
+_READ_TEMPLATE = """
+def make_read(hw):
+    poll_counts = hw.poll_counts
+    const_reads = hw.const_reads
+    read_callbacks = hw.read_callbacks
+    regs = hw.regs
+
+    def read(addr):
+        poll_counts[addr] += 1
+        value = const_reads[addr]
+        if value < 0:
+            callback = read_callbacks[addr]
+            if callback is not None:
+                value = callback(addr)
+            else:
+                value = regs[addr]
+        {log}
+        return value
+
+    return read
+"""
+
+_WRITE_TEMPLATE = """
+def make_write(hw):
+    write_callbacks = hw.write_callbacks
+    regs = hw.regs
+
+    def write(addr, value):
+        {log}
+        callback = write_callbacks[addr]
+        if callback is not None:
+            callback(addr, value)
+        else:
+            regs[addr] = value
+
+    return write
+"""
+
+# name -> (template, log statement)
+_MMIO_TEMPLATES = {
+    'read': (_READ_TEMPLATE,
+             'print(f"[{hw.cycles:8d}] [HW] Read  0x{addr:04X} = 0x{value:02X}")'),
+    'write': (_WRITE_TEMPLATE,
+              'print(f"[{hw.cycles:8d}] [HW] Write 0x{addr:04X} = 0x{value:02X}")'),
+}
+
+_MMIO_FACTORIES = {}
+
+
+def _get_mmio_factory(name: str, log: bool):
+    """Return the make_read/make_write factory for an access kind and log setting."""
+    key = (name, log)
+    factory = _MMIO_FACTORIES.get(key)
+    if factory is None:
+        template, log_line = _MMIO_TEMPLATES[name]
+        src = template.format(log=log_line if log else '')
+        namespace = {}
+        exec(compile(src, f"<hw_{name} log={log}>", 'exec'), namespace)
+        factory = _MMIO_FACTORIES[key] = namespace[f'make_{name}']
+    return factory
+
+
+def _make_poll_rule_read(hw, rule):
+    """
+    Build the read callback for one HardwareState.POLL_RULES entry.
+
+    Conditions a rule does not use are left out of the returned closure,
+    so e.g. the timer CSRs become an unconditional OR and store.
+    """
+    trigger, mask, polls, set_bits = rule
+    regs = hw.regs
+    poll_counts = hw.poll_counts
+    # set_bits ORs mask in; otherwise mask is cleared by ANDing with keep
+    or_bits = mask if set_bits else 0x00
+    keep = 0xFF if set_bits else ~mask & 0xFF
+
+    if polls and trigger:
+        def poll_rule_read(addr):
+            value = regs[addr]
+            if poll_counts[addr] >= polls and value & trigger:
+                value = (value | or_bits) & keep
+                regs[addr] = value
+            return value
+    elif polls:
+        def poll_rule_read(addr):
+            value = regs[addr]
+            if poll_counts[addr] >= polls:
+                value = (value | or_bits) & keep
+                regs[addr] = value
+            return value
+    elif trigger:
+        def poll_rule_read(addr):
+            value = regs[addr]
+            if value & trigger:
+                value = (value | or_bits) & keep
+                regs[addr] = value
+            return value
+    else:
+        def poll_rule_read(addr):
+            value = (regs[addr] | or_bits) & keep
+            regs[addr] = value
+            return value
+
+    return poll_rule_read
+
+
+class PollCounts(array):
+    """Per-address read counters (64-bit), with dict-style get()."""
+
+    __slots__ = ()
+
+    def __new__(cls, size: int):
+        return super().__new__(cls, 'Q', bytes(8 * size))
+
+    def get(self, addr: int, default: int = 0) -> int:
+        if 0 <= addr < len(self):
+            return self[addr]
+        return default
 
 
 class USBState(IntEnum):
@@ -38,6 +191,36 @@ class USBCommand:
     response: bytes = b''  # Response data for read commands
 
 
+# Fixed register values written on every connect() / control transfer,
+# selected by USB speed. 0xCC91 bit 1 and 0x09F9 bit 6 are checked at
+# 0xA7E4-0xA7FF; with both set, 0x0ACC takes the USB3 descriptor path.
+_USB3_MODE_REGS = (
+    (0xCC91, 0x02),  # Bit 1 SET - USB3 mode
+    (0x09F9, 0x40),  # Bit 6 SET - USB3 speed indicator
+)
+_USB2_MODE_REGS = (
+    (0xCC91, 0x00),  # Bit 1 CLEAR - USB2 mode
+    (0x09F9, 0x00),  # Bit 6 CLEAR - USB2 speed indicator
+)
+
+# Registers inject_vendor_command() sets to the same value every time.
+_VENDOR_CMD_STATIC_REGS = (
+    # NOTE: 0x9000 bit 0 must be CLEAR to reach the 0x5333 vendor handler path
+    # At 0x0E68, JB 0xe0.0 jumps away if bit 0 is set
+    (0x9000, 0x80),  # Connected (bit 7), bit 0 CLEAR for vendor path
+    (0x9101, 0x21),  # Bit 5 triggers command handler path
+    (0xC802, 0x05),  # USB interrupt pending
+    # USB endpoint status - signals data available
+    (0x9096, 0x01),  # EP0 has data
+    (0x90E2, 0x01),  # Endpoint status bit
+    # PCIe/DMA status for command processing
+    (0xC47B, 0x01),  # Non-zero for checks
+    (0xC471, 0x01),  # Queue busy
+    (0xB432, 0x07),  # PCIe link status
+    (0xE765, 0x02),  # Ready flag
+)
+
+
 class USBController:
     """
     USB controller emulation using only MMIO registers.
@@ -138,12 +321,7 @@ class USBController:
         # At 0xA7FD-0xA7FF: checks 0x09F9 bit 6 for USB3 speed
         # If both set, 0x0ACC gets value with bit 1 SET, enabling USB3 descriptor path
         # For USB 2.0: clear these bits so firmware takes USB2 path
-        if speed >= 2:  # SuperSpeed or higher
-            self.hw.regs[0xCC91] = 0x02  # Bit 1 SET - USB3 mode
-            self.hw.regs[0x09F9] = 0x40  # Bit 6 SET - USB3 speed indicator
-        else:  # High Speed or Full Speed (USB 2.0)
-            self.hw.regs[0xCC91] = 0x00  # Bit 1 CLEAR - USB2 mode
-            self.hw.regs[0x09F9] = 0x00  # Bit 6 CLEAR - USB2 speed indicator
+        self._set_regs(_USB3_MODE_REGS if speed >= 2 else _USB2_MODE_REGS)
 
         # PCIe enumeration state - simulate that PCIe link is already up
         # In real hardware, PCIe enumeration happens during boot before USB control
@@ -173,6 +351,12 @@ class USBController:
 
         print(f"[{self.hw.cycles:8d}] [USB_CTRL] Connected - MMIO set for enumeration")
 
+    def _set_regs(self, table):
+        """Write a table of (address, value) register pairs."""
+        regs = self.hw.regs
+        for addr, value in table:
+            regs[addr] = value
+
     def advance_enumeration(self):
         """
         Advance USB enumeration state via MMIO.
@@ -243,29 +427,18 @@ class USBController:
 
         # Write CDB to USB interface registers (0x910D-0x9112)
         # Firmware reads these at 0x31C0+ to get command data
-        for i, b in enumerate(cdb):
-            self.hw.regs[0x910D + i] = b
+        self.hw.regs[0x910D:0x910D + len(cdb)] = cdb
 
         # Also populate 0x911F-0x9122 (another CDB location read by 0x3186)
-        for i, b in enumerate(cdb[:4]):
-            self.hw.regs[0x911F + i] = b
+        self.hw.regs[0x911F:0x911F + 4] = cdb[:4]
 
         # USB endpoint buffers
-        for i, b in enumerate(cdb):
-            self.hw.usb_ep_data_buf[i] = b
-            self.hw.usb_ep0_buf[i] = b
+        self.hw.usb_ep_data_buf[:len(cdb)] = cdb
+        self.hw.usb_ep0_buf[:len(cdb)] = cdb
         self.hw.usb_ep0_len = len(cdb)
 
-        # USB connection and interrupt status
-        # NOTE: 0x9000 bit 0 must be CLEAR to reach the 0x5333 vendor handler path
-        # At 0x0E68, JB 0xe0.0 jumps away if bit 0 is set
-        self.hw.regs[0x9000] = 0x80  # Connected (bit 7), bit 0 CLEAR for vendor path
-        self.hw.regs[0x9101] = 0x21  # Bit 5 triggers command handler path
-        self.hw.regs[0xC802] = 0x05  # USB interrupt pending
-
-        # USB endpoint status - signals data available
-        self.hw.regs[0x9096] = 0x01  # EP0 has data
-        self.hw.regs[0x90E2] = 0x01  # Endpoint status bit
+        # USB connection, interrupt, endpoint and PCIe/DMA status
+        self._set_regs(_VENDOR_CMD_STATIC_REGS)
 
         # USB command interface registers
         self.hw.regs[0xE4E0] = cdb[0]  # Command type (0xE4/0xE5)
@@ -297,12 +470,6 @@ class USBController:
         self.hw.regs[0x9E06] = size    # wLength low
         self.hw.regs[0x9E07] = 0x00    # wLength high
 
-        # PCIe/DMA status for command processing
-        self.hw.regs[0xC47B] = 0x01  # Non-zero for checks
-        self.hw.regs[0xC471] = 0x01  # Queue busy
-        self.hw.regs[0xB432] = 0x07  # PCIe link status
-        self.hw.regs[0xE765] = 0x02  # Ready flag
-
         # Store command state
         self.hw.usb_cmd_type = cmd_type
         self.hw.usb_cmd_size = size if cmd_type == 0xE4 else 0
@@ -331,8 +498,7 @@ class USBController:
 
             # CDB area - USB hardware writes CDB to XDATA[0x0002+]
             # The SCSI handler at 0x32E4 reads CDB from this area
-            for i, b in enumerate(cdb):
-                self.hw.memory.xdata[0x0002 + i] = b
+            self.hw.memory.xdata[0x0002:0x0002 + len(cdb)] = cdb
 
             # Vendor command flag at 0x4583 - bit 3 enables vendor dispatch
             # This overlaps with CDB area but has special meaning
@@ -379,13 +545,11 @@ class USBController:
         # =====================================================
 
         # Write CDB to USB interface registers (0x910D-0x911C)
-        for i, b in enumerate(cdb):
-            self.hw.regs[0x910D + i] = b
+        self.hw.regs[0x910D:0x910D + len(cdb)] = cdb
 
         # USB endpoint buffers - write CDB
-        for i, b in enumerate(cdb):
-            self.hw.usb_ep_data_buf[i] = b
-            self.hw.usb_ep0_buf[i] = b
+        self.hw.usb_ep_data_buf[:len(cdb)] = cdb
+        self.hw.usb_ep0_buf[:len(cdb)] = cdb
         self.hw.usb_ep0_len = len(cdb)
 
         # USB connection and interrupt status
@@ -416,8 +580,7 @@ class USBController:
             self.hw.memory.idata[0x6A] = 5
 
             # CDB area - USB hardware writes CDB to XDATA
-            for i, b in enumerate(cdb):
-                self.hw.memory.xdata[0x0002 + i] = b
+            self.hw.memory.xdata[0x0002:0x0002 + len(cdb)] = cdb
 
             # SCSI command flag
             self.hw.memory.xdata[0x0003] = 0x08
@@ -427,10 +590,9 @@ class USBController:
 
             # Pad data to sector boundary and write to USB data buffer at 0x8000
             padded_size = sectors * 512
-            padded_data = data + b'\x00' * (padded_size - len(data))
-            for i, b in enumerate(padded_data):
-                if 0x8000 + i < 0x10000:  # Stay within XDATA bounds
-                    self.hw.memory.xdata[0x8000 + i] = b
+            padded_data = data.ljust(padded_size, b'\x00')
+            n = min(len(padded_data), 0x10000 - 0x8000)  # Stay within XDATA bounds
+            self.hw.memory.xdata[0x8000:0x8000 + n] = padded_data[:n]
 
             # Store data length info
             self.hw.usb_data_len = len(padded_data)
@@ -477,17 +639,14 @@ class USBController:
         # =====================================================
 
         # Write CDB to USB interface registers (0x910D-0x911C)
-        for i, b in enumerate(cdb_padded):
-            self.hw.regs[0x910D + i] = b
+        self.hw.regs[0x910D:0x910D + len(cdb_padded)] = cdb_padded
 
         # Also write to alternate CDB locations firmware may check
-        for i, b in enumerate(cdb_padded):
-            self.hw.regs[0x911F + i] = b
+        self.hw.regs[0x911F:0x911F + len(cdb_padded)] = cdb_padded
 
         # USB endpoint buffers
-        for i, b in enumerate(cdb_padded):
-            self.hw.usb_ep_data_buf[i] = b
-            self.hw.usb_ep0_buf[i] = b
+        self.hw.usb_ep_data_buf[:len(cdb_padded)] = cdb_padded
+        self.hw.usb_ep0_buf[:len(cdb_padded)] = cdb_padded
         self.hw.usb_ep0_len = len(cdb_padded)
 
         # USB connection and interrupt status
@@ -515,8 +674,7 @@ class USBController:
             self.hw.memory.idata[0x6A] = 2
 
             # CDB area - write to XDATA[0x0002+] where firmware reads it
-            for i, b in enumerate(cdb_padded):
-                self.hw.memory.xdata[0x0002 + i] = b
+            self.hw.memory.xdata[0x0002:0x0002 + len(cdb_padded)] = cdb_padded
 
             # Vendor command flags
             self.hw.memory.xdata[0x0003] = 0x08  # Enable vendor dispatch
@@ -535,9 +693,8 @@ class USBController:
 
             # Write data to USB buffer at 0x8000 for write commands
             if is_write and data:
-                for i, b in enumerate(data):
-                    if 0x8000 + i < 0x10000:
-                        self.hw.memory.xdata[0x8000 + i] = b
+                n = min(len(data), 0x10000 - 0x8000)  # Stay within XDATA bounds
+                self.hw.memory.xdata[0x8000:0x8000 + n] = data[:n]
                 self.hw.usb_data_len = len(data)
                 print(f"[{cycles:8d}] [USB_CTRL] Wrote {len(data)} bytes to USB buffer at 0x8000")
 
@@ -618,12 +775,7 @@ class USBController:
 
         # USB mode indicators for descriptor handling at 0xA7E4-0xA7FF and 0x87A1
         # These set bits in 0x0ACC that determine USB2 vs USB3 code paths
-        if speed >= 2:  # SuperSpeed or higher
-            self.hw.regs[0xCC91] = 0x02  # Bit 1 SET - USB3 mode
-            self.hw.regs[0x09F9] = 0x40  # Bit 6 SET - USB3 speed indicator
-        else:  # High Speed or Full Speed (USB 2.0)
-            self.hw.regs[0xCC91] = 0x00  # Bit 1 CLEAR - USB2 mode
-            self.hw.regs[0x09F9] = 0x00  # Bit 6 CLEAR - USB2 speed indicator
+        self._set_regs(_USB3_MODE_REGS if speed >= 2 else _USB2_MODE_REGS)
 
         # Mark control transfer as active for state machine timing
         # This affects the 0x92C2 read callback bit 6 timing
@@ -750,7 +902,25 @@ class USBController:
         print(f"[{cycles:8d}] [USB_CTRL] Control transfer injected (interrupt pending)")
 
 
-@dataclass
+# Raw-mode UART output per byte: printable ASCII, LF and CR pass through,
+# everything else is dropped
+_UART_RAW_TEXT = tuple(chr(b) if 0x20 <= b < 0x7F or b in (0x0A, 0x0D) else ''
+                       for b in range(256))
+
+# Line-mode UART handling per byte
+_UART_SKIP = 0      # CR and non-printable bytes
+_UART_APPEND = 1    # Printable ASCII
+_UART_BRACKET = 2   # ']' - append and flush the [message] block
+_UART_NEWLINE = 3   # LF - flush the buffered line
+_UART_LINE_ACTION = bytes(
+    _UART_NEWLINE if b == 0x0A else
+    _UART_BRACKET if b == 0x5D else
+    _UART_APPEND if 0x20 <= b < 0x7F else
+    _UART_SKIP
+    for b in range(256))
+
+
+@dataclass(slots=True)
 class HardwareState:
     """
     Hardware state for ASM2464PD emulation.
@@ -759,7 +929,8 @@ class HardwareState:
     RAM variables are handled by the memory system.
     """
 
-    # Logging
+    # Logging. Assigning log_reads/log_writes swaps in the matching MMIO
+    # accessor (see _log_flag_property); set_logging() sets both at once.
     log_reads: bool = False
     log_writes: bool = False
     log_uart: bool = True
@@ -771,23 +942,29 @@ class HardwareState:
 
     # Cycle counter for timing-based responses
     cycles: int = 0
+    _timer_next: int = 1000  # Next 1000-cycle boundary checked by tick()
 
     # Hardware state
     usb_connected: bool = False
     usb_connect_delay: int = 500000  # Cycles before USB plug-in event (after init)
 
     # Polling counters - track how many times an address is polled
-    poll_counts: Dict[int, int] = field(default_factory=dict)
+    poll_counts: PollCounts = field(default_factory=lambda: PollCounts(0x10000))
 
     # Register values - only for hardware registers >= 0x6000
-    regs: Dict[int, int] = field(default_factory=dict)
+    regs: RegisterFile = field(default_factory=lambda: RegisterFile(0x10000))
 
-    # Callbacks for specific addresses
-    read_callbacks: Dict[int, Callable[['HardwareState', int], int]] = field(default_factory=dict)
-    write_callbacks: Dict[int, Callable[['HardwareState', int, int], None]] = field(default_factory=dict)
+    # Callbacks for specific addresses (flat tables, None where unset):
+    # read callbacks are called as cb(addr), write callbacks as cb(addr, value)
+    read_callbacks: HookTable = field(default_factory=lambda: HookTable(0x10000))
+    write_callbacks: HookTable = field(default_factory=lambda: HookTable(0x10000))
+
+    # Fixed values for registers that always read the same (-1 where unset).
+    # Checked before read_callbacks and regs; see _setup_callbacks.
+    const_reads: array = field(default_factory=lambda: array('h', [-1]) * 0x10000)
 
     # USB command queue
-    usb_cmd_queue: list = field(default_factory=list)
+    usb_cmd_queue: deque = field(default_factory=deque)
     usb_cmd_pending: bool = False
     usb_ep0_buf: bytearray = field(default_factory=lambda: bytearray(64))  # Control EP buffer (0x9E00)
     usb_ep0_len: int = 0
@@ -799,11 +976,30 @@ class HardwareState:
     memory: 'Memory' = None
 
     # UART output buffer for line-based output
-    uart_buffer: str = ""
+    uart_buffer: bytearray = field(default_factory=bytearray)
 
     # USB command injection timing
     usb_injected: bool = False
 
+    # Register image left by _init_registers(), shared by all instances
+    _default_regs: ClassVar[Optional[bytes]] = None
+
+    # Status registers that change state once the firmware has polled them.
+    # addr -> (trigger, mask, polls, set_bits): after `polls` reads, and only
+    # while a bit in `trigger` is set (0 = unconditionally), OR `mask` into
+    # the register if set_bits else clear it. Each row gets a read callback
+    # from _make_poll_rule_read().
+    POLL_RULES: ClassVar[Dict[int, Tuple[int, int, int, bool]]] = {
+        0xC8B8: (0x01, 0x01, 3, False),  # Flash/DMA busy - auto-clear
+        0xCC11: (0x00, 0x02, 0, True),   # Timer CSRs - ready on first poll
+        0xCC17: (0x00, 0x02, 0, True),
+        0xCC1D: (0x00, 0x02, 0, True),
+        0xCC23: (0x00, 0x02, 0, True),
+        0xCC89: (0x00, 0x02, 0, True),   # Timer/DMA status - complete
+        0xE41C: (0x01, 0x01, 3, False),  # Command engine - auto-clear bit 0
+        0xE712: (0x00, 0x03, 2, True),   # USB EP0 transfer complete
+    }
+
     # USB controller instance (created in __post_init__)
     usb_controller: 'USBController' = None
 
@@ -819,6 +1015,9 @@ class HardwareState:
     usb_inject_cmd: tuple = None  # (cmd_type, addr, val_or_size)
     usb_inject_delay: int = 1000  # Cycles after USB connect to inject
 
+    # Set by USB command injection; tick() raises EX0 and clears it
+    _pending_usb_interrupt: bool = False
+
     # USB state machine emulation
     # Tracks firmware USB state to know when to set register bits
     usb_state_machine_phase: int = 0  # 0=init, 1=waiting, 2=enumerating, 3=ready
@@ -887,13 +1086,70 @@ class HardwareState:
     xdata_trace_addrs: Dict[int, str] = field(default_factory=dict)  # addr -> name
     xdata_write_log: list = field(default_factory=list)  # Log of traced writes
 
+    # CPU reference for PC-tagged logging (set by the Emulator)
+    _cpu_ref: 'CPU8051' = None
+
+    # Per-register poll/progress counters used by individual callbacks
+    _pcie_read_count: int = 0  # 0xB296 reads
+    _c4ec_read_count: int = 0  # 0xC4EC reads in the EP loop
+    _usb_9091_read_count: int = 0
+    _usb_9091_setup_writes: int = 0
+    _usb_config_captured_offsets: Set[int] = field(default_factory=set)
+    _e5_dma_done: bool = False
+    _e5_value_delivered: bool = False
+
+    # MMIO read/write accessors, installed by set_logging(). Assigning
+    # either one re-points Memory's hook tables (see _mmio_accessor_property).
+    # read(addr) serves a hardware register read, write(addr, value) a write.
+    # addr is a 16-bit register address (>= 0x6000) and value a byte; Memory
+    # masks both before calling, so the accessors do no range checks.
+    read: Callable[[int], int] = field(default=None, init=False, repr=False)
+    write: Callable[[int, int], None] = field(default=None, init=False, repr=False)
+
     def __post_init__(self):
         """Initialize hardware register defaults."""
-        self._init_registers()
+        # _init_registers() only stores constants: run it once per process and
+        # copy the resulting 64KB image into later instances
+        image = HardwareState._default_regs
+        if image is None:
+            self._init_registers()
+            HardwareState._default_regs = bytes(self.regs)
+        else:
+            self.regs[:] = image
         self._setup_callbacks()
+        # Serve reads/writes from closures over the (now fixed) register tables
+        self.read = _get_mmio_factory('read', self.log_reads)(self)
+        self.write = _get_mmio_factory('write', self.log_writes)(self)
         # Create USB controller after self is initialized
         self.usb_controller = USBController(self)
 
+    def set_logging(self, reads: bool, writes: bool):
+        """
+        Enable or disable MMIO read/write logging.
+
+        Each flag installs the generated read/write variant for its
+        setting, so the disabled case carries no logging test at all.
+        Assigning hw.log_reads or hw.log_writes does the same for one
+        direction.
+        """
+        self.log_reads = reads
+        self.log_writes = writes
+
+    def install_mmio(self, read: Callable[[int], int] = None,
+                     write: Callable[[int, int], None] = None):
+        """
+        Install new MMIO read and/or write accessors.
+
+        Same as assigning hw.read/hw.write: the setters re-point every
+        Memory XDATA hook table entry that held the previous accessor, so
+        the replacement sees all firmware MMIO traffic. Watched addresses
+        (Emulator.setup_watch) forward to whatever accessor is current.
+        """
+        if read is not None:
+            self.read = read
+        if write is not None:
+            self.write = write
+
     def _init_registers(self):
         """
         Set default values for hardware registers.
@@ -1009,6 +1265,7 @@ class HardwareState:
         # ============================================
         # SCSI/DMA Registers (0xCExx)
         # ============================================
+        self.regs[0xCE00] = 0x03  # SCSI DMA control - in progress until firmware writes it
         self.regs[0xCE5D] = 0xFF  # Debug enable mask - all levels enabled
         self.regs[0xCE89] = 0x01  # SCSI DMA status - bit 0 = ready
 
@@ -1052,41 +1309,36 @@ class HardwareState:
         # PCIe DMA trigger - E4/E5 command DMA
         self.write_callbacks[0xB296] = self._pcie_dma_trigger
 
-        # Flash CSR - auto-complete
-        self.read_callbacks[0xC8A9] = self._flash_csr_read
+        # Flash CSR - always idle (bit 0 busy clear); operations complete instantly
+        self.const_reads[0xC8A9] = 0x00
         self.write_callbacks[0xC8AA] = self._flash_cmd_write
 
         # Flash data register - read/write actual flash data
         self.read_callbacks[0xC8AE] = self._flash_data_read
         self.write_callbacks[0xC8AE] = self._flash_data_write
 
-        # DMA status
-        self.read_callbacks[0xC8D6] = self._dma_status_read
+        # DMA status - done
+        self.const_reads[0xC8D6] = 0x04
 
-        # Flash/DMA busy - auto-clear
-        self.read_callbacks[0xC8B8] = self._busy_reg_read
+        # Flash/DMA busy, timer CSRs, command engine and EP0 transfer status
+        # settle after polling - see POLL_RULES
+        for addr, rule in self.POLL_RULES.items():
+            self.read_callbacks[addr] = _make_poll_rule_read(self, rule)
 
         # System interrupt status - clear on read
         self.read_callbacks[0xC806] = self._int_status_read
 
         # Timer CSRs
         for addr in [0xCC11, 0xCC17, 0xCC1D, 0xCC23]:
-            self.read_callbacks[addr] = self._timer_csr_read
             self.write_callbacks[addr] = self._timer_csr_write
 
-        # Timer/DMA status register (0xCC89) - set complete bit after polling
-        self.read_callbacks[0xCC89] = self._timer_dma_status_read
-
-        # PHY init status - also handles descriptor DMA trigger on write
-        self.read_callbacks[0xCD31] = self._phy_status_read
-        self.write_callbacks[0xCD31] = self._phy_cmd_write
-
-        # Command engine status
-        self.read_callbacks[0xE41C] = self._cmd_engine_read
+        # PHY init status - reads return ready: bit 0 set, bit 1 (busy) clear.
+        # Writes are PHY commands and go to the plain register store; USB
+        # descriptor data is sent via hardware DMA from the ROM table (~0x0864)
+        self.const_reads[0xCD31] = 0x01
 
-        # PD interrupt status - set by USB PD events
-        self.read_callbacks[0xCA0D] = self._pd_interrupt_read
-        self.read_callbacks[0xCA0E] = self._pd_interrupt_read
+        # PD interrupt status (0xCA0D/0xCA0E) - set by USB PD events and read
+        # back unchanged, so no callback is needed
 
         # USB state machine MMIO registers (see registers.h for definitions)
         # REG_USB_DMA_STATE (0xCE89): USB/DMA status - controls state transitions
@@ -1095,7 +1347,8 @@ class HardwareState:
         #   USB_DMA_STATE_COMPLETE (bit 2): Controls state 3→4 transition (0x3588)
         self.read_callbacks[0xCE89] = self._usb_ce89_read
         # REG_XFER_STATUS_CE86 (0xCE86): USB status - bit 4 checked at 0x349D
-        self.read_callbacks[0xCE86] = self._usb_ce86_read
+        # Always 0: bit 4 clear (no error/busy) allows the normal init path
+        self.const_reads[0xCE86] = 0x00
         # REG_XFER_STATUS_CE6C (0xCE6C): USB controller ready - bit 7 must be set
         self.read_callbacks[0xCE6C] = self._usb_ce6c_read
         # REG_SCSI_DMA_CTRL (0xCE00): DMA control register - returns 0 after completion
@@ -1111,18 +1364,16 @@ class HardwareState:
 
         # USB Setup Packet buffer (REG_USB_SETUP_* at 0x9E00-0x9E07)
         # Hardware writes 8-byte setup packet here when received from host
-        for addr in range(0x9E00, 0x9E40):
-            self.read_callbacks[addr] = self._usb_ep0_buf_read
-            self.write_callbacks[addr] = self._usb_ep0_buf_write
+        self.read_callbacks.set_range(0x9E00, 0x9E40, self._usb_ep0_buf_read)
+        self.write_callbacks.set_range(0x9E00, 0x9E40, self._usb_ep0_buf_write)
 
         # USB EP0 CSR (0x9E10)
         self.read_callbacks[0x9E10] = self._usb_ep0_csr_read
         self.write_callbacks[0x9E10] = self._usb_ep0_csr_write
 
         # USB EP data buffer (0xD800-0xDFFF) - endpoint data for bulk/control transfers
-        for addr in range(0xD800, 0xE000):
-            self.read_callbacks[addr] = self._usb_ep_data_buf_read
-            self.write_callbacks[addr] = self._usb_ep_data_buf_write
+        self.read_callbacks.set_range(0xD800, 0xE000, self._usb_ep_data_buf_read)
+        self.write_callbacks.set_range(0xD800, 0xE000, self._usb_ep_data_buf_write)
 
         # USB endpoint selection/status registers
         self.read_callbacks[0xC4EC] = self._usb_ep_status_read
@@ -1132,13 +1383,11 @@ class HardwareState:
 
         # USB endpoint data ready registers (0x90A1-0x90C0)
         # These indicate which endpoints have data available
-        for addr in range(0x90A1, 0x90C1):
-            self.read_callbacks[addr] = self._usb_ep_data_ready_read
+        self.read_callbacks.set_range(0x90A1, 0x90C1, self._usb_ep_data_ready_read)
 
         # USB endpoint status registers (0x9096-0x90A0)
         # These control whether command handler path is taken (0 = process cmd)
-        for addr in range(0x9096, 0x90A1):
-            self.read_callbacks[addr] = self._usb_ep_status_reg_read
+        self.read_callbacks.set_range(0x9096, 0x90A1, self._usb_ep_status_reg_read)
 
         # USB EP buffer address registers (0x905B/0x905C)
         # Firmware writes DMA source address here, hardware DMAs from this address
@@ -1151,11 +1400,6 @@ class HardwareState:
         self.read_callbacks[0xC47A] = self._usb_e5_value_read
         self.write_callbacks[0xC47A] = self._usb_e5_value_write
 
-        # USB EP0 transfer status (0xE712)
-        # The firmware polls this waiting for bits 0 and 1 to be set
-        # indicating EP0 control transfer complete
-        self.read_callbacks[0xE712] = self._usb_ep0_transfer_status_read
-
         # USB PHY control (0x91C0)
         # Firmware clears this at 0xCA8C but needs bit 1 SET for USB state machine
         # at 0x203B to progress from state 2 (0x0A59=2).
@@ -1200,8 +1444,7 @@ class HardwareState:
         #   XDATA 0xE423 → Code ROM 0x0627 (device descriptor)
         #   XDATA 0xE437 → Code ROM 0x063B (language ID)
         #   XDATA 0xE6xx → Code ROM 0x08xx (additional descriptors)
-        for addr in range(0xE400, 0xE700):
-            self.read_callbacks[addr] = self._flash_rom_mirror_read
+        self.read_callbacks.set_range(0xE400, 0xE700, self._flash_rom_mirror_read)
 
     # ============================================
     # Execution Tracing
@@ -1331,7 +1574,7 @@ class HardwareState:
     # ============================================
     # UART Callbacks
     # ============================================
-    def _uart_tx(self, hw: 'HardwareState', addr: int, value: int):
+    def _uart_tx(self, addr: int, value: int):
         """Handle UART transmit with message buffering.
 
         NOTE: 0xC001 was previously thought to be shared with USB EP0 FIFO,
@@ -1342,33 +1585,36 @@ class HardwareState:
         firmware-driven byte copying to 0xC001.
         """
         if self.log_uart:
-            if value == 0x0A:  # Newline - print buffered line
-                if self.uart_buffer:
-                    print(f"[{self.cycles:8d}] [UART] {self.uart_buffer}")
-                    self.uart_buffer = ""
-            elif value == 0x0D:  # Carriage return - ignore
-                pass
-            elif 0x20 <= value < 0x7F:  # Printable ASCII
-                self.uart_buffer += chr(value)
+            buf = self.uart_buffer
+            action = _UART_LINE_ACTION[value]
+            if action == _UART_APPEND:
+                buf.append(value)
+            elif action == _UART_NEWLINE:  # Print buffered line
+                if buf:
+                    self._uart_flush_line()
+            elif action == _UART_BRACKET:
                 # Flush on ']' to show complete [message] blocks
-                if chr(value) == ']':
-                    print(f"[{self.cycles:8d}] [UART] {self.uart_buffer}")
-                    self.uart_buffer = ""
+                buf.append(value)
+                self._uart_flush_line()
             # For very long lines, flush periodically
-            if len(self.uart_buffer) > 200:
-                print(f"[{self.cycles:8d}] [UART] {self.uart_buffer}")
-                self.uart_buffer = ""
+            if len(buf) > 200:
+                self._uart_flush_line()
         else:
-            try:
-                if 0x20 <= value < 0x7F or value in (0x0A, 0x0D):
-                    print(chr(value), end='', flush=True)
-            except:
-                pass
+            # Raw mode: let stdout's own buffering batch characters instead
+            # of flushing once per byte
+            text = _UART_RAW_TEXT[value]
+            if text:
+                sys.stdout.write(text)
+
+    def _uart_flush_line(self):
+        """Print the buffered UART line with a cycle timestamp and clear it."""
+        print(f"[{self.cycles:8d}] [UART] {self.uart_buffer.decode('ascii')}")
+        self.uart_buffer.clear()
 
     # ============================================
     # PCIe Callbacks
     # ============================================
-    def _pcie_status_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _pcie_status_read(self, addr: int) -> int:
         """
         PCIe status read at 0xB296.
         Multiple code paths check different bits:
@@ -1377,21 +1623,19 @@ class HardwareState:
         Return value with both bits set after polling.
         """
         # Count reads and set completion bits after some polls
-        if not hasattr(self, '_pcie_read_count'):
-            self._pcie_read_count = 0
         self._pcie_read_count += 1
 
         # Return current value with completion bits OR'd in after 5 reads
-        value = self.regs.get(addr, 0x00)
+        value = self.regs[addr]
         if self._pcie_read_count >= 5:
             value |= 0x06  # Set bits 1 and 2
         return value
 
-    def _pcie_trigger_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _pcie_trigger_write(self, addr: int, value: int):
         """PCIe trigger - set complete status (bit 2)."""
         self.regs[0xB296] = 0x06  # bit 1 + bit 2 = complete
 
-    def _pcie_dma_trigger(self, hw: 'HardwareState', addr: int, value: int):
+    def _pcie_dma_trigger(self, addr: int, value: int):
         """
         PCIe DMA trigger at 0xB296.
 
@@ -1408,9 +1652,9 @@ class HardwareState:
         # Value 0x08 is the E4/E5 DMA trigger
         if value == 0x08:
             # Get target address from CDB (big-endian: 0x910F=high, 0x9110=mid, 0x9111=low)
-            addr_high = self.regs.get(0x910F, 0)
-            addr_mid = self.regs.get(0x9110, 0)
-            addr_low = self.regs.get(0x9111, 0)
+            addr_high = self.regs[0x910F]
+            addr_mid = self.regs[0x9110]
+            addr_low = self.regs[0x9111]
             target_addr = (addr_high << 16) | (addr_mid << 8) | addr_low
 
             # Check command type to determine operation
@@ -1418,7 +1662,7 @@ class HardwareState:
 
             if cmd_type == 0xE5:
                 # E5 WRITE: Write single byte from CDB to XDATA
-                write_value = self.regs.get(0x910E, 0)
+                write_value = self.regs[0x910E]
                 xdata_addr = target_addr & 0xFFFF
 
                 if self.log_pcie:
@@ -1438,7 +1682,7 @@ class HardwareState:
 
             else:
                 # E4 READ: Copy from XDATA to USB buffer
-                size = self.regs.get(0x910E, 0)
+                size = self.regs[0x910E]
 
                 if self.log_pcie:
                     print(f"[{self.cycles:8d}] [PCIe] DMA TRIGGER: src=0x{target_addr:06X} size={size}")
@@ -1509,15 +1753,7 @@ class HardwareState:
     # ============================================
     # Flash/DMA Callbacks
     # ============================================
-    def _flash_csr_read(self, hw: 'HardwareState', addr: int) -> int:
-        """
-        Flash CSR read - returns status.
-        Bit 0: Busy (0 = idle, 1 = operation in progress)
-        """
-        # Flash is always ready (operations complete instantly in emulation)
-        return 0x00
-
-    def _flash_cmd_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _flash_cmd_write(self, addr: int, value: int):
         """
         Flash command write - triggers flash operations.
 
@@ -1531,9 +1767,9 @@ class HardwareState:
         - 0x04: Write disable
         """
         # Get flash address from address registers
-        addr_hi = self.regs.get(0xC8AB, 0)
-        addr_mid = self.regs.get(0xC8AC, 0)
-        addr_lo = self.regs.get(0xC8AD, 0)
+        addr_hi = self.regs[0xC8AB]
+        addr_mid = self.regs[0xC8AC]
+        addr_lo = self.regs[0xC8AD]
         flash_addr = (addr_hi << 16) | (addr_mid << 8) | addr_lo
         self.spi_flash_addr = flash_addr
 
@@ -1543,20 +1779,17 @@ class HardwareState:
         if value == 0x20:  # Sector erase (4KB)
             sector_start = flash_addr & ~0xFFF
             if sector_start + 0x1000 <= len(self.spi_flash):
-                for i in range(0x1000):
-                    self.spi_flash[sector_start + i] = 0xFF
+                self.spi_flash[sector_start:sector_start + 0x1000] = b'\xff' * 0x1000
                 print(f"[{self.cycles:8d}] [SPI_FLASH] Erased sector at 0x{sector_start:06X}")
 
         elif value == 0xD8:  # Block erase (64KB)
             block_start = flash_addr & ~0xFFFF
             if block_start + 0x10000 <= len(self.spi_flash):
-                for i in range(0x10000):
-                    self.spi_flash[block_start + i] = 0xFF
+                self.spi_flash[block_start:block_start + 0x10000] = b'\xff' * 0x10000
                 print(f"[{self.cycles:8d}] [SPI_FLASH] Erased block at 0x{block_start:06X}")
 
         elif value == 0xC7:  # Chip erase
-            for i in range(len(self.spi_flash)):
-                self.spi_flash[i] = 0xFF
+            self.spi_flash[:] = b'\xff' * len(self.spi_flash)
             print(f"[{self.cycles:8d}] [SPI_FLASH] Chip erased")
 
         elif value == 0x02:  # Page program - data comes from USB buffer
@@ -1567,7 +1800,7 @@ class HardwareState:
         # Mark operation complete
         self.regs[0xC8A9] = 0x00  # Clear busy
 
-    def _flash_data_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _flash_data_write(self, addr: int, value: int):
         """
         Flash data write - writes data to flash during page program.
         Data is written byte-by-byte to the current flash address.
@@ -1581,7 +1814,7 @@ class HardwareState:
                 if self.log_writes:
                     print(f"[{self.cycles:8d}] [SPI_FLASH] Write byte 0x{value:02X} to 0x{flash_addr:06X}")
 
-    def _flash_data_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _flash_data_read(self, addr: int) -> int:
         """
         Flash data read - reads data from flash at current address.
         Returns the byte at spi_flash_addr and auto-increments.
@@ -1602,8 +1835,7 @@ class HardwareState:
                 data = f.read()
             # Copy to flash, don't exceed flash size
             copy_size = min(len(data), len(self.spi_flash))
-            for i in range(copy_size):
-                self.spi_flash[i] = data[i]
+            self.spi_flash[:copy_size] = data[:copy_size]
             print(f"[SPI_FLASH] Loaded {copy_size} bytes from {path}")
         except Exception as e:
             print(f"[SPI_FLASH] Failed to load from {path}: {e}")
@@ -1617,20 +1849,7 @@ class HardwareState:
         except Exception as e:
             print(f"[SPI_FLASH] Failed to save to {path}: {e}")
 
-    def _dma_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """DMA status - done."""
-        return 0x04
-
-    def _busy_reg_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Busy register - auto-clear after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        if count >= 3 and (value & 0x01):
-            value &= ~0x01
-            self.regs[addr] = value
-        return value
-
-    def _flash_rom_mirror_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _flash_rom_mirror_read(self, addr: int) -> int:
         """
         Flash/Code ROM mirror read.
 
@@ -1651,21 +1870,17 @@ class HardwareState:
     # ============================================
     # Interrupt Callbacks
     # ============================================
-    def _int_status_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _int_status_read(self, addr: int) -> int:
         """System interrupt status - clear on read."""
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
         if value & 0x01:
             self.regs[addr] = value & ~0x01
         return value
 
-    def _pd_interrupt_read(self, hw: 'HardwareState', addr: int) -> int:
-        """PD interrupt status - returns current state."""
-        return self.regs.get(addr, 0)
-
     # ============================================
     # USB State Machine MMIO Callbacks
     # ============================================
-    def _usb_ce89_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ce89_read(self, addr: int) -> int:
         """
         USB/DMA status register 0xCE89.
 
@@ -1718,7 +1933,7 @@ class HardwareState:
         if self.log_reads or self.usb_cmd_pending:
             # Add PC for better tracing
             pc = 0
-            if hasattr(self, '_cpu_ref') and self._cpu_ref:
+            if self._cpu_ref:
                 pc = self._cpu_ref.pc
             print(f"[{self.cycles:8d}] [USB_SM] Read 0xCE89 = 0x{value:02X} (count={self.usb_ce89_read_count}, PC=0x{pc:04X})")
 
@@ -1747,17 +1962,7 @@ class HardwareState:
     # DO NOT implement _find_descriptor_in_xdata or similar functions!
     # ============================================
 
-    def _usb_ce86_read(self, hw: 'HardwareState', addr: int) -> int:
-        """
-        USB status register 0xCE86.
-
-        Bit 4: Checked at 0x349D (JNB 0xe0.4) - must be clear for normal path.
-        """
-        # Return 0 to allow normal USB initialization path
-        # Bit 4 clear means no error/busy condition
-        return 0x00
-
-    def _usb_ce6c_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ce6c_read(self, addr: int) -> int:
         """
         USB controller status register 0xCE6C.
 
@@ -1773,7 +1978,7 @@ class HardwareState:
             return 0x80  # Bit 7 set - USB ready
         return 0x00
 
-    def _usb_ce00_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ce00_read(self, addr: int) -> int:
         """
         DMA control register 0xCE00.
 
@@ -1791,16 +1996,16 @@ class HardwareState:
         # Return 0 after a few reads to simulate DMA completion
         if self.usb_ce00_read_count >= 2:
             return 0x00  # DMA complete
-        return self.regs.get(0xCE00, 0x03)  # DMA in progress
+        return self.regs[0xCE00]  # DMA in progress
 
-    def _usb_ce00_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ce00_write(self, addr: int, value: int):
         """
         DMA control write - resets DMA state for new transfer.
         """
         self.regs[0xCE00] = value
         self.usb_ce00_read_count = 0  # Reset counter for new DMA operation
 
-    def _usb_ce55_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ce55_read(self, addr: int) -> int:
         """
         Transfer slot count register 0xCE55.
 
@@ -1813,7 +2018,7 @@ class HardwareState:
         print(f"[{self.cycles:8d}] [USB_CE55] Read CE55 = 0x01 (transfer slots)")
         return 0x01  # 1 transfer slot for control transfers
 
-    def _usb_ce88_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ce88_write(self, addr: int, value: int):
         """
         DMA trigger register 0xCE88.
 
@@ -1831,61 +2036,13 @@ class HardwareState:
     # ============================================
     # Timer Callbacks
     # ============================================
-    def _timer_csr_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Timer CSR - auto-set ready bit after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        # The firmware polls for bit 1 (0x02) to be set - indicating timer ready/complete
-        # Set bit 1 after a few polls to avoid infinite wait
-        if count >= 2:
-            value |= 0x02  # Set ready/complete bit
-            self.regs[addr] = value
-        return value
-
-    def _timer_csr_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _timer_csr_write(self, addr: int, value: int):
         """Timer CSR write."""
         if value & 0x04:  # Clear flag
             value &= ~0x02
         self.regs[addr] = value
         self.poll_counts[addr] = 0
 
-    def _timer_dma_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Timer/DMA status (0xCC89) - set complete bit after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        # The firmware polls for bit 1 (0x02) to be set - indicating DMA complete
-        if count >= 2:
-            value |= 0x02  # Set complete bit
-            self.regs[addr] = value
-        return value
-
-    # ============================================
-    # PHY/CPU Callbacks
-    # ============================================
-    def _phy_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """PHY status - bit 0 = ready, bit 1 = busy."""
-        # Return ready state: bit 0 set, bit 1 clear
-        return 0x01
-
-    def _phy_cmd_write(self, hw: 'HardwareState', addr: int, value: int):
-        """
-        PHY command register write (0xCD31).
-
-        This is a PHY/hardware control register. The firmware writes commands
-        to it during USB operations. USB descriptor data is sent via hardware DMA
-        directly from the descriptor table in ROM (around 0x0864).
-        """
-        self.regs[addr] = value
-
-    def _cmd_engine_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Command engine - auto-clear bit 0 after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        if count >= 3 and (value & 0x01):
-            value &= ~0x01
-            self.regs[addr] = value
-        return value
-
     # ============================================
     # USB Command Injection
     # ============================================
@@ -2075,12 +2232,12 @@ class HardwareState:
         if not self.usb_cmd_queue:
             return None
 
-        cmd = self.usb_cmd_queue.pop(0)
+        cmd = self.usb_cmd_queue.popleft()
         print(f"[USB] Processing cmd=0x{cmd.cmd:02X} addr=0x{cmd.addr:04X}")
 
         # Copy command to EP0 buffer
-        for i, b in enumerate(cmd.data[:64]):
-            self.usb_ep0_buf[i] = b
+        data = cmd.data[:64]
+        self.usb_ep0_buf[:len(data)] = data
         self.usb_ep0_len = len(cmd.data)
 
         # Handle E4 read - prepare response data
@@ -2106,14 +2263,14 @@ class HardwareState:
     # ============================================
     # USB Endpoint Callbacks
     # ============================================
-    def _usb_ep0_buf_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep0_buf_read(self, addr: int) -> int:
         """Read from USB EP0 buffer (0x9E00-0x9E3F)."""
         offset = addr - 0x9E00
         if offset < len(self.usb_ep0_buf):
             return self.usb_ep0_buf[offset]
         return 0x00
 
-    def _usb_ep0_buf_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep0_buf_write(self, addr: int, value: int):
         """Write to USB EP0 buffer (0x9E00-0x9E3F).
 
         This captures config descriptor writes. The firmware writes the config
@@ -2124,8 +2281,6 @@ class HardwareState:
         offset = addr - 0x9E00
 
         # Track which bytes have been captured (to ignore later overwrites)
-        if not hasattr(self, '_usb_config_captured_offsets'):
-            self._usb_config_captured_offsets = set()
 
         # Check for start of config descriptor (bLength=0x09, bDescriptorType=0x02)
         if offset == 0 and value == 0x09:
@@ -2279,7 +2434,7 @@ class HardwareState:
             return bytes(base_desc[:requested_len])
         return bytes(base_desc[:min(requested_len, len(base_desc))])
 
-    def _usb_ep0_csr_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep0_csr_read(self, addr: int) -> int:
         """Read USB EP0 CSR - check if command pending."""
         # Process next command when firmware reads CSR
         if self.usb_cmd_pending and self.usb_cmd_queue:
@@ -2287,7 +2442,7 @@ class HardwareState:
             return 0x01  # Data ready
         return 0x00
 
-    def _usb_ep0_csr_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep0_csr_write(self, addr: int, value: int):
         """Write USB EP0 CSR - acknowledge command."""
         if value & 0x80:  # Clear data ready
             self.regs[0x9E10] = 0x00
@@ -2295,23 +2450,7 @@ class HardwareState:
             if self.usb_cmd_queue:
                 self._trigger_usb_interrupt()
 
-    def _usb_ep0_transfer_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """
-        USB EP0 transfer status (0xE712).
-
-        The firmware polls this register waiting for bits 0 and 1 to be set,
-        indicating the USB EP0 control transfer is complete.
-        This happens after calling 0xE581 which initiates the DMA transfer.
-        """
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        # After a few polls, set both bits to indicate transfer complete
-        if count >= 2:
-            value |= 0x03  # Set bits 0 and 1 (transfer complete)
-            self.regs[addr] = value
-        return value
-
-    def _usb_91c0_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_91c0_read(self, addr: int) -> int:
         """
         USB PHY control read (0x91C0).
 
@@ -2324,9 +2463,9 @@ class HardwareState:
         """
         if self.usb_connected:
             return 0x02  # Bit 1 SET - enables USB state machine progress
-        return self.regs.get(addr, 0)
+        return self.regs[addr]
 
-    def _usb_92c2_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_92c2_read(self, addr: int) -> int:
         """
         USB power state read (0x92C2).
 
@@ -2347,9 +2486,9 @@ class HardwareState:
             # ALWAYS return bit 6 SET during control transfers to prevent
             # the state reset at 0xBDA4 from clearing 0x0AF7
             return 0x40
-        return self.regs.get(addr, 0x40)  # Default: bit 6 SET (PD task enabled)
+        return self.regs[addr]
 
-    def _usb_ep0_fifo_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep0_fifo_write(self, addr: int, value: int):
         """
         USB EP0 data FIFO write (UNUSED).
 
@@ -2362,7 +2501,7 @@ class HardwareState:
         if self.log_writes:
             print(f"[{self.cycles:8d}] [USB] EP0 FIFO write: 0x{value:02X} (total: {len(self.usb_ep0_fifo)} bytes)")
 
-    def _usb_ep0_dma_trigger_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep0_dma_trigger_write(self, addr: int, value: int):
         """
         USB EP0 DMA control write (0x9092).
 
@@ -2380,12 +2519,12 @@ class HardwareState:
             # We DMA from the firmware-specified address to USB buffer at 0x8000
 
             # Read DMA source address from firmware-configured registers
-            dma_addr_hi = self.regs.get(0x905B, 0)
-            dma_addr_lo = self.regs.get(0x905C, 0)
+            dma_addr_hi = self.regs[0x905B]
+            dma_addr_lo = self.regs[0x905C]
             dma_src_addr = (dma_addr_hi << 8) | dma_addr_lo
 
             # Read transfer length from firmware-configured register
-            dma_len = self.regs.get(0x9004, 0)
+            dma_len = self.regs[0x9004]
             if dma_len == 0:
                 # Fallback: use stored wLength from pending descriptor request
                 # (can't read from 0x9E06-0x9E07 because firmware overwrote with descriptor data)
@@ -2395,7 +2534,7 @@ class HardwareState:
                 else:
                     # Last resort: read bLength from first byte of descriptor at 0x9E00
                     # This works for single descriptors like device/string
-                    bLength = self.regs.get(0x9E00, 0)
+                    bLength = self.regs[0x9E00]
                     if 2 <= bLength <= 255:
                         dma_len = bLength
                     else:
@@ -2406,8 +2545,7 @@ class HardwareState:
             if self.memory and dma_src_addr > 0 and dma_len > 0:
                 # Firmware specified a code ROM address - DMA from there
                 desc_data = bytes(self.memory.code[dma_src_addr:dma_src_addr + dma_len])
-                for i, b in enumerate(desc_data):
-                    self.memory.xdata[0x8000 + i] = b
+                self.memory.xdata[0x8000:0x8000 + len(desc_data)] = desc_data
                 print(f"[{self.cycles:8d}] [USB] DMA'd {len(desc_data)} bytes from code 0x{dma_src_addr:04X} to 0x8000: {desc_data[:min(32, len(desc_data))].hex()}")
             elif dma_src_addr == 0 and dma_len > 0:
                 # Firmware set src to 0 - DMA from EP0 buffer at 0x9E00 where firmware wrote data
@@ -2424,10 +2562,9 @@ class HardwareState:
                     print(f"[{self.cycles:8d}] [USB] Using captured config descriptor ({dma_len} bytes)")
                 else:
                     # Use current 0x9E00 buffer content
-                    desc_data = bytes([self.regs.get(0x9E00 + i, 0) for i in range(dma_len)])
+                    desc_data = bytes(self.regs[0x9E00:0x9E00 + dma_len])
 
-                for i, b in enumerate(desc_data):
-                    self.memory.xdata[0x8000 + i] = b
+                self.memory.xdata[0x8000:0x8000 + len(desc_data)] = desc_data
                 print(f"[{self.cycles:8d}] [USB] DMA'd {dma_len} bytes from EP0 buffer 0x9E00 to 0x8000: {desc_data[:min(32, dma_len)].hex()}")
 
             self.usb_control_transfer_active = False
@@ -2437,8 +2574,8 @@ class HardwareState:
 
         elif value == 0x04:
             # DMA trigger - read length from 0x9003-0x9004
-            len_lo = self.regs.get(0x9003, 0)
-            len_hi = self.regs.get(0x9004, 0)
+            len_lo = self.regs[0x9003]
+            len_hi = self.regs[0x9004]
             length = (len_hi << 8) | len_lo
 
             print(f"[{self.cycles:8d}] [USB] EP0 DMA trigger: length={length}, FIFO has {len(self.usb_ep0_fifo)} bytes")
@@ -2446,8 +2583,7 @@ class HardwareState:
             # Copy FIFO data to USB data buffer at 0x8000
             if self.memory and len(self.usb_ep0_fifo) > 0:
                 copy_len = min(length, len(self.usb_ep0_fifo))
-                for i in range(copy_len):
-                    self.memory.xdata[0x8000 + i] = self.usb_ep0_fifo[i]
+                self.memory.xdata[0x8000:0x8000 + copy_len] = self.usb_ep0_fifo[:copy_len]
 
                 print(f"[{self.cycles:8d}] [USB] EP0 DMA: copied {copy_len} bytes to 0x8000")
                 print(f"[{self.cycles:8d}] [USB] EP0 DMA: data = {bytes(self.usb_ep0_fifo[:copy_len]).hex()}")
@@ -2461,7 +2597,7 @@ class HardwareState:
             # Set bit 2 (busy) - will be cleared on next read after poll
             self.regs[addr] = value | 0x04
 
-    def _usb_ep0_dma_status_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep0_dma_status_read(self, addr: int) -> int:
         """
         USB EP0 DMA status read (0x9092).
 
@@ -2469,8 +2605,8 @@ class HardwareState:
         After the initial write of 0x04, the hardware will clear bit 2
         when the transfer is done.
         """
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
+        count = self.poll_counts[addr]
+        value = self.regs[addr]
 
         # After a few polls, clear bit 2 (DMA complete)
         if count >= 2 and (value & 0x04):
@@ -2480,7 +2616,7 @@ class HardwareState:
 
         return value
 
-    def _usb_9091_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_9091_read(self, addr: int) -> int:
         """
         USB control state register read (0x9091).
 
@@ -2491,16 +2627,15 @@ class HardwareState:
         The firmware loops at 0xA5E2-0xA60B writing 0x01 and waiting for bit 0 to clear.
         When bit 0 clears and bit 1 is set, 0xD088 is called for DMA response.
         """
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # Track read count for phase transition
-        count = getattr(self, '_usb_9091_read_count', 0)
-        self._usb_9091_read_count = count + 1
+        self._usb_9091_read_count += 1
 
         # Phase transition: after setup handler has processed the request,
         # clear bit 0 and set bit 1 to trigger data phase
         # The setup handler writes 0x01 repeatedly, so we detect that pattern
-        if getattr(self, '_usb_9091_setup_writes', 0) >= 3 and (value & 0x01):
+        if self._usb_9091_setup_writes >= 3 and (value & 0x01):
             value = 0x02  # Clear bit 0, set bit 1 for data phase
             self.regs[addr] = value
             self._usb_9091_setup_writes = 0  # Reset for next transfer
@@ -2508,7 +2643,7 @@ class HardwareState:
 
         return value
 
-    def _usb_9091_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_9091_write(self, addr: int, value: int):
         """
         USB control state register write (0x9091).
 
@@ -2520,12 +2655,11 @@ class HardwareState:
 
         # Count writes of 0x01 (setup phase polling)
         if value == 0x01:
-            count = getattr(self, '_usb_9091_setup_writes', 0)
-            self._usb_9091_setup_writes = count + 1
+            self._usb_9091_setup_writes += 1
             if self.log_writes:
-                print(f"[{self.cycles:8d}] [USB] 0x9091 write 0x01 (setup poll #{count + 1})")
+                print(f"[{self.cycles:8d}] [USB] 0x9091 write 0x01 (setup poll #{self._usb_9091_setup_writes})")
 
-    def _usb_9301_status_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_9301_status_read(self, addr: int) -> int:
         """
         USB endpoint status read (0x9301).
 
@@ -2533,7 +2667,7 @@ class HardwareState:
         After reading, hardware clears bit 6 (acknowledge behavior).
         This allows the main loop at 0xD83B to proceed after the interrupt dispatch.
         """
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # Clear bit 6 after reading (hardware acknowledge)
         if value & 0x40:
@@ -2543,7 +2677,7 @@ class HardwareState:
 
         return value
 
-    def _usb_9301_ep0_arm_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_9301_ep0_arm_write(self, addr: int, value: int):
         """
         USB endpoint 0 arm/control write (0x9301).
 
@@ -2558,13 +2692,13 @@ class HardwareState:
             print(f"[{self.cycles:8d}] [USB] EP0 armed (9301=0x{value:02X})")
 
             # Log the request type for debugging (but don't process it!)
-            bmRequestType = self.regs.get(0x9E00, 0)
-            bRequest = self.regs.get(0x9E01, 0)
+            bmRequestType = self.regs[0x9E00]
+            bRequest = self.regs[0x9E01]
 
             if bmRequestType == 0x80 and bRequest == 0x06:  # GET_DESCRIPTOR
-                desc_type = self.regs.get(0x9E03, 0)
-                desc_index = self.regs.get(0x9E02, 0)
-                wLength = self.regs.get(0x9E06, 0) | (self.regs.get(0x9E07, 0) << 8)
+                desc_type = self.regs[0x9E03]
+                desc_index = self.regs[0x9E02]
+                wLength = self.regs[0x9E06] | (self.regs[0x9E07] << 8)
                 print(f"[{self.cycles:8d}] [USB] GET_DESCRIPTOR: type=0x{desc_type:02X} "
                       f"index={desc_index} len={wLength} (firmware will handle via DMA)")
                 # NOTE: The emulator does NOT populate the buffer here!
@@ -2574,7 +2708,7 @@ class HardwareState:
             # Mark control transfer completion status
             # - IN transfers (bit 7 set): Stay active until DMA completes (at 0x9092 write)
             # - OUT transfers (bit 7 clear): Complete when EP0 armed for status stage
-            wLength = self.regs.get(0x9E06, 0) | (self.regs.get(0x9E07, 0) << 8)
+            wLength = self.regs[0x9E06] | (self.regs[0x9E07] << 8)
             if bmRequestType & 0x80:
                 # IN transfer (GET_DESCRIPTOR etc.) - stay active until DMA completes
                 # The flag will be cleared by _usb_ep0_dma_trigger_write when DMA finishes
@@ -2608,18 +2742,18 @@ class HardwareState:
     # DO NOT resurrect this function!
     # ============================================================
 
-    def _usb_ep_data_buf_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep_data_buf_read(self, addr: int) -> int:
         """Read from USB EP data buffer (0xD800-0xDFFF)."""
         offset = addr - 0xD800
         if offset < len(self.usb_ep_data_buf):
             value = self.usb_ep_data_buf[offset]
-            # Always log reads from command area (first 8 bytes)
-            if offset < 8:
+            # Trace reads from the command area (first 8 bytes) with MMIO reads
+            if offset < 8 and self.log_reads:
                 print(f"[{self.cycles:8d}] [USB] Read EP buf 0x{addr:04X} = 0x{value:02X}")
             return value
         return 0x00
 
-    def _usb_ep_buf_addr_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep_buf_addr_write(self, addr: int, value: int):
         """Write to USB EP buffer address registers (0x905B/0x905C).
 
         Firmware writes the DMA source address here:
@@ -2634,7 +2768,7 @@ class HardwareState:
         else:
             print(f"[{self.cycles:8d}] [DMA] EP buf addr low = 0x{value:02X}")
 
-    def _usb_ep_data_buf_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep_data_buf_write(self, addr: int, value: int):
         """Write to USB EP data buffer (0xD800-0xDFFF).
 
         D800 is the DMA control register. Writing 0x03 or 0x04 triggers DMA:
@@ -2651,13 +2785,13 @@ class HardwareState:
         # DMA trigger at D800
         if addr == 0xD800 and value in (0x03, 0x04):
             # Get source address from registers firmware wrote
-            src_hi = self.regs.get(0x905B, 0)
-            src_lo = self.regs.get(0x905C, 0)
+            src_hi = self.regs[0x905B]
+            src_lo = self.regs[0x905C]
             src_addr = (src_hi << 8) | src_lo
 
             if src_addr > 0 and self.memory:
                 # Get transfer length from D807 or use default
-                xfer_len = self.regs.get(0xD807, 0)
+                xfer_len = self.regs[0xD807]
                 if xfer_len == 0:
                     xfer_len = 64  # Default EP0 max packet size
 
@@ -2665,19 +2799,24 @@ class HardwareState:
                       f"src=0x{src_addr:04X} len={xfer_len}")
 
                 # Perform DMA: read from source, write to USB buffer at 0x8000
-                for i in range(xfer_len):
-                    # Read from XDATA (includes flash mirror via callbacks)
-                    byte = self._read_xdata_for_dma(src_addr + i)
-                    self.memory.xdata[0x8000 + i] = byte
+                if src_addr + xfer_len <= 0x8000 or src_addr >= 0x8000 + xfer_len:
+                    # Source and buffer don't overlap: copy as one block
+                    self.memory.xdata[0x8000:0x8000 + xfer_len] = \
+                        self._read_xdata_block_for_dma(src_addr, xfer_len)
+                else:
+                    for i in range(xfer_len):
+                        # Read from XDATA (includes flash mirror via callbacks)
+                        byte = self._read_xdata_for_dma(src_addr + i)
+                        self.memory.xdata[0x8000 + i] = byte
 
                 print(f"[{self.cycles:8d}] [DMA] Copied {xfer_len} bytes from 0x{src_addr:04X} to 0x8000")
 
         # E5 write DMA (uses different address registers)
         if addr == 0xD800 and value == 0x04 and self.usb_cmd_type == 0xE5:
-            if not getattr(self, '_e5_dma_done', False):
-                data = self.regs.get(0xC4E8, 0)
-                addr_hi = self.regs.get(0xC4EA, 0)
-                addr_lo = self.regs.get(0xC4EB, 0)
+            if not self._e5_dma_done:
+                data = self.regs[0xC4E8]
+                addr_hi = self.regs[0xC4EA]
+                addr_lo = self.regs[0xC4EB]
                 target_addr = (addr_hi << 8) | addr_lo
 
                 if data != 0xFF and target_addr > 0:
@@ -2691,15 +2830,31 @@ class HardwareState:
 
     def _read_xdata_for_dma(self, addr: int) -> int:
         """Read from XDATA for DMA, using callbacks if registered."""
-        # Check for callback (e.g., flash mirror)
+        # Check for fixed-value registers and callbacks (e.g., flash mirror)
+        if 0 <= addr < 0x10000 and self.const_reads[addr] >= 0:
+            return self.const_reads[addr]
         if addr in self.read_callbacks:
-            return self.read_callbacks[addr](self, addr)
+            return self.read_callbacks[addr](addr)
         # Direct XDATA read
         if self.memory and addr < len(self.memory.xdata):
             return self.memory.xdata[addr]
         return 0x00
 
-    def _usb_ep_status_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _read_xdata_block_for_dma(self, addr: int, length: int) -> bytes:
+        """
+        Read length bytes of XDATA for DMA, as _read_xdata_for_dma would.
+
+        Blocks with no fixed-value register or callback in them come
+        straight from one slice of XDATA; others go byte by byte.
+        """
+        end = addr + length
+        if (self.memory and end <= len(self.memory.xdata)
+                and max(self.const_reads[addr:end], default=-1) < 0
+                and not any(self.read_callbacks[addr:end])):
+            return bytes(self.memory.xdata[addr:end])
+        return bytes(self._read_xdata_for_dma(a) for a in range(addr, end))
+
+    def _usb_ep_status_read(self, addr: int) -> int:
         """
         Read USB EP status register 0xC4EC - indicates USB data availability.
 
@@ -2712,8 +2867,6 @@ class HardwareState:
         """
         # Track EP loop iterations
         if self.usb_cmd_pending:
-            if not hasattr(self, '_c4ec_read_count'):
-                self._c4ec_read_count = 0
             self._c4ec_read_count += 1
 
             # For E5 commands, return 0x00 to take the E5 path at 0x18A8
@@ -2735,9 +2888,9 @@ class HardwareState:
             return value
 
         # Normal read when no command pending
-        return self.regs.get(addr, 0x00)
+        return self.regs[addr]
 
-    def _usb_ep_index_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_ep_index_write(self, addr: int, value: int):
         """Write USB EP index register 0xC4ED - selects which endpoint to query."""
         # Low 5 bits are the endpoint index (0-31)
         self.usb_ep_selected = value & 0x1F
@@ -2745,7 +2898,7 @@ class HardwareState:
         if self.usb_cmd_pending:
             print(f"[{self.cycles:8d}] [USB] Select EP index {self.usb_ep_selected}")
 
-    def _usb_ep_id_low_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep_id_low_read(self, addr: int) -> int:
         """Read USB EP ID low byte (0xC4EE) for currently selected endpoint."""
         # When USB command pending and EP0 selected, return the value from RAM 0x0056
         # This matches what firmware expects (it compares 0xC4EE/0xC4EF with 0x0056/0x0057)
@@ -2756,7 +2909,7 @@ class HardwareState:
             return expected
         return 0xFF  # No endpoint / invalid
 
-    def _usb_ep_id_high_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep_id_high_read(self, addr: int) -> int:
         """Read USB EP ID high byte (0xC4EF) for currently selected endpoint."""
         # When USB command pending and EP0 selected, return the value from RAM 0x0057
         # This matches what firmware expects (it compares 0xC4EE/0xC4EF with 0x0056/0x0057)
@@ -2767,13 +2920,13 @@ class HardwareState:
             return expected
         return 0xFF  # No endpoint / invalid
 
-    def _usb_ep_data_ready_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep_data_ready_read(self, addr: int) -> int:
         """
         Read USB endpoint data ready register (0x90A1-0x90C0).
         Returns bit 0 = 1 when USB command is pending for that endpoint.
         """
         ep_index = addr - 0x90A1  # EP0 is at 0x90A1, EP1 at 0x90A2, etc.
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # When USB command pending and this is the target endpoint, keep bit 0 set
         if self.usb_cmd_pending and ep_index == 0:
@@ -2782,7 +2935,7 @@ class HardwareState:
                 print(f"[{self.cycles:8d}] [USB] EP{ep_index} data ready = 0x{value:02X} (cmd pending)")
         return value
 
-    def _usb_ep_status_reg_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_ep_status_reg_read(self, addr: int) -> int:
         """
         Read USB endpoint status register (0x9096-0x90A0).
 
@@ -2793,7 +2946,7 @@ class HardwareState:
         For EP index N, bit (N % 8) must be set in register 0x9096 + (N / 8).
         """
         ep_index = addr - 0x9096  # EP0 is at 0x9096, EP1 at 0x9097, etc.
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # When USB command pending and this is EP0, return non-zero to enable command processing
         # The firmware ANDs this value with a bit mask (0x01 for EP0) and checks if non-zero
@@ -2803,7 +2956,7 @@ class HardwareState:
             return value
         return value
 
-    def _usb_e5_value_read(self, hw: 'HardwareState', addr: int) -> int:
+    def _usb_e5_value_read(self, addr: int) -> int:
         """
         Read USB E5 value register 0xC47A.
 
@@ -2831,9 +2984,9 @@ class HardwareState:
             return value
 
         # Normal read
-        return self.regs.get(addr, 0x00)
+        return self.regs[addr]
 
-    def _usb_e5_value_write(self, hw: 'HardwareState', addr: int, value: int):
+    def _usb_e5_value_write(self, addr: int, value: int):
         """
         Write USB E5 value register 0xC47A.
 
@@ -2850,161 +3003,202 @@ class HardwareState:
         self.regs[addr] = value
 
     # ============================================
-    # Main Read/Write Interface
+    # Tick - Advance Hardware State
     # ============================================
-    def read(self, addr: int) -> int:
-        """Read from hardware register."""
-        addr &= 0xFFFF
-
-        # Only handle hardware registers (>= 0x6000)
-        if addr < 0x6000:
-            return 0x00  # Should not be called for RAM
-
-        self.poll_counts[addr] = self.poll_counts.get(addr, 0) + 1
+    def tick(self, cycles: int, cpu=None):
+        """Advance hardware state by cycles."""
+        self.cycles = cycles = self.cycles + cycles
 
-        # Debug: trace CE55 reads
-        if addr == 0xCE55:
-            has_callback = addr in self.read_callbacks
-            print(f"[{self.cycles:8d}] [DEBUG] Reading CE55, callback registered: {has_callback}")
+        # Periodic timer interrupt on each exact multiple of 1000 cycles.
+        # Ticks advance by a few cycles at a time, so only test the remainder
+        # once the next multiple has been reached or passed.
+        if cycles >= self._timer_next:
+            if cycles % 1000 == 0:
+                self.regs[0xC806] |= 0x01
+            self._timer_next = cycles - cycles % 1000 + 1000
 
-        if addr in self.read_callbacks:
-            value = self.read_callbacks[addr](self, addr)
-        elif addr in self.regs:
-            value = self.regs[addr]
-        else:
-            value = 0x00
+        # Steady state: connected, nothing (left) to inject, no interrupt to raise
+        if self.usb_connected:
+            if not self._pending_usb_interrupt and (self.usb_injected or not self.usb_inject_cmd):
+                return
+        # USB plug-in event after delay
+        # Skip if a USB command is already pending to avoid interfering with it
+        elif cycles > self.usb_connect_delay and not self.usb_cmd_pending:
+            self._usb_plug_in(cpu)
 
-        if self.log_reads:
-            print(f"[{self.cycles:8d}] [HW] Read  0x{addr:04X} = 0x{value:02X}")
+        # Inject USB command after USB connected and additional delay
+        # Only inject if usb_inject_cmd was set (via --usb-cmd option)
+        if self.usb_connected and not self.usb_injected and self.usb_inject_cmd:
+            if cycles > self.usb_connect_delay + self.usb_inject_delay:
+                self._inject_configured_command()
 
-        return value
+        # Trigger EX0 interrupt after USB command injection
+        if self._pending_usb_interrupt and cpu:
+            self._raise_usb_interrupt(cpu)
 
-    def write(self, addr: int, value: int):
-        """Write to hardware register."""
-        addr &= 0xFFFF
-        value &= 0xFF
+    def _usb_plug_in(self, cpu):
+        """USB plug-in event, fired once by tick() after usb_connect_delay."""
+        self.usb_connected = True
+        print(f"\n[{self.cycles:8d}] [HW] === USB PLUG-IN EVENT ===")
 
-        # Only handle hardware registers (>= 0x6000)
-        if addr < 0x6000:
-            return  # Should not be called for RAM
+        # Update USB hardware registers via USBController
+        self.usb_controller.connect()
 
-        if self.log_writes:
-            print(f"[{self.cycles:8d}] [HW] Write 0x{addr:04X} = 0x{value:02X}")
+        # Set NVMe queue busy - triggers the usb_ep_loop_180d(1) call
+        self.regs[0xC471] = 0x01  # Bit 0 - queue busy
 
-        if addr in self.write_callbacks:
-            self.write_callbacks[addr](self, addr, value)
-        else:
-            self.regs[addr] = value
+        # Re-enable PD task path by setting 0x91C0 bit 1
+        # The firmware clears this at 0xCA8B during init, but we need it set
+        # for the main loop at 0x2027 to call the PD task at 0x0322
+        self.regs[0x91C0] = 0x02  # Bit 1 - enables PD task in main loop
 
-    # ============================================
-    # Tick - Advance Hardware State
-    # ============================================
-    def tick(self, cycles: int, cpu=None):
-        """Advance hardware state by cycles."""
-        self.cycles += cycles
+        # Set PD interrupt pending - this triggers the PD handler
+        # Bit 2 (0x04) is the fallback path at 0x9354 when 0x0A9D != 0x01/0x02
+        # Bit 3 (0x08) is for port 1 when 0x0A9D == 0x01
+        self.regs[0xCA0D] = 0x0C  # Bits 2+3 - PD interrupt (covers both paths)
+        self.regs[0xCA0E] = 0x04  # Bit 2 - PD interrupt for port 2
 
-        # USB plug-in event after delay
-        # Skip if a USB command is already pending to avoid interfering with it
-        if not self.usb_connected and self.cycles > self.usb_connect_delay and not self.usb_cmd_pending:
-            self.usb_connected = True
-            print(f"\n[{self.cycles:8d}] [HW] === USB PLUG-IN EVENT ===")
+        # Set debug trigger
+        self.regs[0xC80A] = 0x40  # Bit 6 - triggers PD debug output at 0x935E
 
-            # Update USB hardware registers via USBController
-            self.usb_controller.connect()
+        # Set PD event info for debug output
+        # These are read by 0xAE89 to print [PD_int:XX:XX] and determine message type
+        self.regs[0xE40F] = 0x01  # PD event type (bit 0 = Source_Cap)
+        self.regs[0xE410] = 0x00  # PD sub-event
 
-            # Set NVMe queue busy - triggers the usb_ep_loop_180d(1) call
-            self.regs[0xC471] = 0x01  # Bit 0 - queue busy
-
-            # Re-enable PD task path by setting 0x91C0 bit 1
-            # The firmware clears this at 0xCA8B during init, but we need it set
-            # for the main loop at 0x2027 to call the PD task at 0x0322
-            self.regs[0x91C0] = 0x02  # Bit 1 - enables PD task in main loop
-
-            # Set PD interrupt pending - this triggers the PD handler
-            # Bit 2 (0x04) is the fallback path at 0x9354 when 0x0A9D != 0x01/0x02
-            # Bit 3 (0x08) is for port 1 when 0x0A9D == 0x01
-            self.regs[0xCA0D] = 0x0C  # Bits 2+3 - PD interrupt (covers both paths)
-            self.regs[0xCA0E] = 0x04  # Bit 2 - PD interrupt for port 2
-
-            # Set debug trigger
-            self.regs[0xC80A] = 0x40  # Bit 6 - triggers PD debug output at 0x935E
-
-            # Set PD event info for debug output
-            # These are read by 0xAE89 to print [PD_int:XX:XX] and determine message type
-            self.regs[0xE40F] = 0x01  # PD event type (bit 0 = Source_Cap)
-            self.regs[0xE410] = 0x00  # PD sub-event
-
-            print(f"[{self.cycles:8d}] [HW] USB: 0x9000=0x81, C802=0x05, C471=0x01, CA0D=0x0C, E40F=0x01")
-            print(f"[{self.cycles:8d}] [HW] USB state machine: firmware will poll 0xCE89 to transition states")
-
-            # Trigger External Interrupt 0 to invoke the interrupt handler at 0x0E33
-            # This requires IE register (0xA8) to have EA (bit 7) and EX0 (bit 0) set
-            if cpu:
-                # Enable global interrupts (EA) and EX0 in IE register
-                ie = self.memory.read_sfr(0xA8) if self.memory else 0
-                ie |= 0x81  # EA (bit 7) + EX0 (bit 0)
-                if self.memory:
-                    self.memory.write_sfr(0xA8, ie)
-                cpu._ext0_pending = True
-                print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt (IE=0x{ie:02X})")
+        print(f"[{self.cycles:8d}] [HW] USB: 0x9000=0x81, C802=0x05, C471=0x01, CA0D=0x0C, E40F=0x01")
+        print(f"[{self.cycles:8d}] [HW] USB state machine: firmware will poll 0xCE89 to transition states")
+
+        # Trigger External Interrupt 0 to invoke the interrupt handler at 0x0E33
+        # This requires IE register (0xA8) to have EA (bit 7) and EX0 (bit 0) set
+        if cpu:
+            ie = self._raise_ex0(cpu)
+            print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt (IE=0x{ie:02X})")
+
+    def _inject_configured_command(self):
+        """Inject the --usb-cmd command, fired once by tick() after usb_inject_delay."""
+        self.usb_injected = True
+        cmd_type, addr, val_or_size = self.usb_inject_cmd
+        print(f"\n[{self.cycles:8d}] [HW] === INJECTING USB COMMAND ===")
+        if cmd_type == 0xE4:
+            self.inject_usb_command(0xE4, addr, size=val_or_size)
+        elif cmd_type == 0xE5:
+            self.inject_usb_command(0xE5, addr, value=val_or_size)
+        else:
+            print(f"[HW] Unknown USB command type: 0x{cmd_type:02X}")
+
+    def _raise_usb_interrupt(self, cpu):
+        """Raise the EX0 interrupt requested by a USB command injection."""
+        self._pending_usb_interrupt = False
+        ie = self._raise_ex0(cpu)
+        print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt for USB command (IE=0x{ie:02X})")
+
+    def _raise_ex0(self, cpu) -> int:
+        """Enable EA and EX0 in IE, mark EX0 pending, and return the new IE value."""
+        memory = self.memory
+        if memory is None:
+            ie = 0x81
+        else:
+            ie = memory.read_sfr(0xA8) | 0x81  # EA (bit 7) + EX0 (bit 0)
+            memory.write_sfr(0xA8, ie)
+        cpu._ext0_pending = True
+        return ie
+
+
+# MMIO accessors and logging flags are plain dataclass slot fields. Each is
+# wrapped here in a property whose setter keeps the installed accessors in
+# step: assigning hw.read/hw.write re-points Memory's hook tables at the
+# new accessor (so hw.write = fn intercepts firmware MMIO writes), and
+# assigning hw.log_reads/hw.log_writes installs the matching generated
+# accessor.
+def _mmio_accessor_property(name: str):
+    slot = HardwareState.__dict__[name]
+    table = f'xdata_{name}_hooks'
+
+    def fset(self, accessor):
+        try:
+            old = slot.__get__(self)
+        except AttributeError:  # first assignment, from __init__
+            old = None
+        slot.__set__(self, accessor)
+        memory = self.memory
+        if memory is not None and old is not None and accessor is not None:
+            _repoint_mmio_hooks(getattr(memory, table), old, accessor)
+
+    return property(slot.__get__, fset)
+
+
+def _log_flag_property(name: str, accessor: str):
+    slot = HardwareState.__dict__[name]
+
+    def fset(self, enabled):
+        enabled = bool(enabled)
+        slot.__set__(self, enabled)
+        # Before __post_init__ has installed the accessors, only store
+        if getattr(self, accessor, None) is not None:
+            setattr(self, accessor, _get_mmio_factory(accessor, enabled)(self))
+
+    return property(slot.__get__, fset)
+
+
+HardwareState.read = _mmio_accessor_property('read')
+HardwareState.write = _mmio_accessor_property('write')
+HardwareState.log_reads = _log_flag_property('log_reads', 'read')
+HardwareState.log_writes = _log_flag_property('log_writes', 'write')
+
+
+# Hardware register ranges (all >= 0x6000)
+# NOTE: 0x7000-0x7FFF is flash buffer RAM, NOT hardware registers
+_MMIO_RANGES = (
+    (0x8000, 0x9000),   # USB/SCSI Data Buffer
+    (0x9000, 0x9400),   # USB Interface
+    (0x92C0, 0x9300),   # Power Management
+    (0x9E00, 0xA000),   # USB Control Buffer
+    (0xB200, 0xB900),   # PCIe Passthrough
+    (0xC000, 0xC100),   # UART
+    (0xC400, 0xC600),   # NVMe Interface
+    (0xC600, 0xC700),   # PHY Extended
+    (0xC800, 0xC900),   # Interrupt/DMA/Flash
+    (0xCA00, 0xCB00),   # PD Controller
+    (0xCC00, 0xCF00),   # Timer/CPU/SCSI
+    (0xD800, 0xE000),   # USB Endpoint Data Buffer
+    (0xE300, 0xE400),   # PHY Completion / Debug
+    (0xE400, 0xE500),   # Command Engine
+    (0xE700, 0xE800),   # System Status
+)
+
+
+def _merge_ranges(ranges):
+    """Sort [start, end) ranges and fold overlapping or abutting ones together."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
 
-        # Periodic timer interrupt
-        if self.cycles % 1000 == 0:
-            self.regs[0xC806] |= 0x01
 
-        # Inject USB command after USB connected and additional delay
-        # Only inject if usb_inject_cmd was set (via --usb-cmd option)
-        if self.usb_connected and not self.usb_injected and self.usb_inject_cmd:
-            if self.cycles > self.usb_connect_delay + self.usb_inject_delay:
-                self.usb_injected = True
-                cmd_type, addr, val_or_size = self.usb_inject_cmd
-                print(f"\n[{self.cycles:8d}] [HW] === INJECTING USB COMMAND ===")
-                if cmd_type == 0xE4:
-                    self.inject_usb_command(0xE4, addr, size=val_or_size)
-                elif cmd_type == 0xE5:
-                    self.inject_usb_command(0xE5, addr, value=val_or_size)
-                else:
-                    print(f"[HW] Unknown USB command type: 0x{cmd_type:02X}")
+# _MMIO_RANGES with overlapping/abutting ranges folded together
+_MMIO_HOOK_RANGES = tuple(_merge_ranges(_MMIO_RANGES))
 
-        # Trigger EX0 interrupt after USB command injection
-        if hasattr(self, '_pending_usb_interrupt') and self._pending_usb_interrupt and cpu:
-            self._pending_usb_interrupt = False
-            # Enable global interrupts (EA) and EX0 in IE register
-            ie = self.memory.read_sfr(0xA8) if self.memory else 0
-            ie |= 0x81  # EA (bit 7) + EX0 (bit 0)
-            if self.memory:
-                self.memory.write_sfr(0xA8, ie)
-            cpu._ext0_pending = True
-            print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt for USB command (IE=0x{ie:02X})")
 
+def _repoint_mmio_hooks(table, old, new):
+    """Replace hook table entries in the MMIO ranges that hold old with new."""
+    for start, end in _MMIO_HOOK_RANGES:
+        hooks = table[start:end]
+        if hooks.count(old) == end - start:  # Common case: no watches inside
+            table[start:end] = [new] * (end - start)
+        else:
+            table[start:end] = [new if hook is old else hook for hook in hooks]
 
 
 def create_hardware_hooks(memory: 'Memory', hw: HardwareState):
     """
     Register hardware hooks with memory system.
-    Only hooks hardware register addresses (>= 0x6000).
+    Only hooks hardware register addresses (>= 0x6000), see _MMIO_RANGES.
     """
 
-    # Hardware register ranges (all >= 0x6000)
-    # NOTE: 0x7000-0x7FFF is flash buffer RAM, NOT hardware registers
-    mmio_ranges = [
-        (0x8000, 0x9000),   # USB/SCSI Data Buffer
-        (0x9000, 0x9400),   # USB Interface
-        (0x92C0, 0x9300),   # Power Management
-        (0x9E00, 0xA000),   # USB Control Buffer
-        (0xB200, 0xB900),   # PCIe Passthrough
-        (0xC000, 0xC100),   # UART
-        (0xC400, 0xC600),   # NVMe Interface
-        (0xC600, 0xC700),   # PHY Extended
-        (0xC800, 0xC900),   # Interrupt/DMA/Flash
-        (0xCA00, 0xCB00),   # PD Controller
-        (0xCC00, 0xCF00),   # Timer/CPU/SCSI
-        (0xD800, 0xE000),   # USB Endpoint Data Buffer
-        (0xE300, 0xE400),   # PHY Completion / Debug
-        (0xE400, 0xE500),   # Command Engine
-        (0xE700, 0xE800),   # System Status
-    ]
-
     # Set memory reference for USB commands
     hw.memory = memory
 
@@ -3020,30 +3214,20 @@ def create_hardware_hooks(memory: 'Memory', hw: HardwareState):
             if hw_ref.xdata_trace_enabled:
                 # Get PC from CPU if available
                 pc = 0
-                if hasattr(hw_ref, '_cpu_ref') and hw_ref._cpu_ref:
+                if hw_ref._cpu_ref:
                     pc = hw_ref._cpu_ref.pc
                 hw_ref.trace_xdata_write(addr, value, pc)
             # Perform actual write
             return original_write(addr, value)
         return hook
 
-    def make_read_hook(hw_ref):
-        def hook(addr):
-            return hw_ref.read(addr)
-        return hook
-
-    def make_write_hook(hw_ref):
-        def hook(addr, value):
-            hw_ref.write(addr, value)
-        return hook
-
-    read_hook = make_read_hook(hw)
-    write_hook = make_write_hook(hw)
+    # The accessors go straight into the hook tables; assigning hw.read or
+    # hw.write later re-points these entries
+    read_hook = hw.read
+    write_hook = hw.write
 
-    for start, end in mmio_ranges:
-        for addr in range(start, end):
-            memory.xdata_read_hooks[addr] = read_hook
-            memory.xdata_write_hooks[addr] = write_hook
+    for start, end in _MMIO_HOOK_RANGES:
+        memory.register_xdata_range(start, end, read_hook, write_hook)
 
     # Debug hooks for XDATA can be added here when needed
     # Example: Trace reads/writes to specific addresses
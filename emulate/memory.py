@@ -13,6 +13,47 @@ from typing import Callable, Optional, Dict
 from dataclasses import dataclass, field
 
 
+class HookTable(list):
+    """
+    Flat address -> hook table, with None where no hook is installed.
+
+    Hot paths index it directly (`table[addr]`) instead of hashing into a
+    dict. The dict-style helpers (get, in, keys, items, del) that callers
+    and tests use are kept and work on addresses with a hook installed;
+    plain iteration and len() are those of the underlying list.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, size: int):
+        super().__init__([None] * size)
+
+    def get(self, addr: int, default=None):
+        if 0 <= addr < len(self):
+            hook = list.__getitem__(self, addr)
+            if hook is not None:
+                return hook
+        return default
+
+    def __contains__(self, addr) -> bool:
+        return self.get(addr) is not None
+
+    def __delitem__(self, addr: int):
+        if self.get(addr) is None:
+            raise KeyError(addr)
+        self[addr] = None
+
+    def set_range(self, start: int, end: int, hook):
+        """Install hook for every address in [start, end) with one slice assignment."""
+        self[start:end] = [hook] * (end - start)
+
+    def keys(self):
+        return [addr for addr, hook in enumerate(self) if hook is not None]
+
+    def items(self):
+        return [(addr, hook) for addr, hook in enumerate(self) if hook is not None]
+
+
 @dataclass
 class Memory:
     """Memory subsystem for ASM2464PD emulation."""
@@ -24,8 +65,8 @@ class Memory:
     sfr: bytearray = field(default_factory=lambda: bytearray(128))  # 0x80-0xFF
 
     # XDATA read/write hooks for MMIO
-    xdata_read_hooks: Dict[int, Callable[[int], int]] = field(default_factory=dict)
-    xdata_write_hooks: Dict[int, Callable[[int, int], None]] = field(default_factory=dict)
+    xdata_read_hooks: HookTable = field(default_factory=lambda: HookTable(0x10000))
+    xdata_write_hooks: HookTable = field(default_factory=lambda: HookTable(0x10000))
 
     # IDATA read/write hooks (for USB state and other internal RAM emulation)
     idata_read_hooks: Dict[int, Callable[[int], int]] = field(default_factory=dict)
@@ -44,9 +85,15 @@ class Memory:
     SFR_DPX = 0x96
 
     def load_firmware(self, data: bytes, offset: int = 0):
-        """Load firmware binary into code memory."""
+        """
+        Load firmware binary into code memory.
+
+        Accepts any buffer (bytes, bytearray, mmap); the image is copied
+        once, straight from the buffer into the code bytearray.
+        """
         end = min(offset + len(data), len(self.code))
-        self.code[offset:end] = data[:end - offset]
+        with memoryview(data) as view:
+            self.code[offset:end] = view[:end - offset]
 
     # Bank 1 base offset in firmware file
     # Bank 1 code starts at file offset 0xFF6B, mapped to address space 0x8000-0xFFFF
@@ -80,6 +127,31 @@ class Memory:
             return self.code[addr]
         return 0xFF
 
+    def read_code_block(self, addr: int, length: int) -> bytes:
+        """
+        Read `length` consecutive CODE bytes starting at addr, with banking.
+
+        Uses a single slice of the code image when the block stays inside
+        one bank window; blocks straddling 0x8000 or wrapping past 0xFFFF
+        fall back to per-byte read_code().
+        """
+        addr &= 0xFFFF
+        end = addr + length
+
+        if addr >= 0x8000:
+            if end > 0x10000:
+                return bytes(self.read_code(addr + i) for i in range(length))
+            if self.sfr[self.SFR_DPX - 0x80] & 1:  # Bank 1
+                addr = self.BANK1_FILE_BASE + (addr - 0x8000)
+                end = addr + length
+        elif end > 0x8000:
+            return bytes(self.read_code(addr + i) for i in range(length))
+
+        block = bytes(self.code[addr:end])
+        if len(block) < length:
+            block += b'\xff' * (length - len(block))
+        return block
+
     def read_idata(self, addr: int) -> int:
         """Read from IDATA (internal 256 bytes) with hooks."""
         addr &= 0xFF
@@ -109,13 +181,21 @@ class Memory:
     SYNC_FLAG_ADDRS = {0x1238}  # Timer/DMA sync flag at 0x1238
     SYNC_FLAG_CLEAR_AFTER = 5   # Clear after this many polls
 
+    def register_xdata_range(self, start: int, end: int,
+                             read_hook: Callable[[int], int],
+                             write_hook: Callable[[int, int], None]):
+        """Install one read and one write hook for every XDATA address in [start, end)."""
+        self.xdata_read_hooks.set_range(start, end, read_hook)
+        self.xdata_write_hooks.set_range(start, end, write_hook)
+
     def read_xdata(self, addr: int) -> int:
         """Read from XDATA with MMIO hooks."""
         addr &= 0xFFFF
 
         # Check for MMIO hooks
-        if addr in self.xdata_read_hooks:
-            return self.xdata_read_hooks[addr](addr)
+        hook = self.xdata_read_hooks[addr]
+        if hook is not None:
+            return hook(addr)
 
         # Handle DMA/timer sync flags - auto-clear after polling
         # This simulates hardware completing the DMA/timer operation
@@ -140,8 +220,9 @@ class Memory:
         value &= 0xFF
 
         # Check for MMIO hooks
-        if addr in self.xdata_write_hooks:
-            self.xdata_write_hooks[addr](addr, value)
+        hook = self.xdata_write_hooks[addr]
+        if hook is not None:
+            hook(addr, value)
             return
 
         self.xdata[addr] = value
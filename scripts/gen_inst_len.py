@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+gen_inst_len.py - Generate the 8051 instruction length table for emulate/emu.py
+
+Builds the 256-entry opcode -> instruction length table from the INSTRUCTIONS
+map in emulate/disasm8051.py and prints it as the _INST_LEN bytes literal.
+Unknown opcodes are 1 byte. Paste the output into emu.py whenever the
+opcode map changes (test_emulator.py checks the two stay in sync).
+"""
+
+import sys
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(PROJECT_ROOT / "emulate"))
+
+from disasm8051 import INSTRUCTIONS
+
+
+def build_inst_len():
+    """Return the instruction length table as 256 bytes."""
+    return bytes(INSTRUCTIONS[op][1] if op in INSTRUCTIONS else 1 for op in range(256))
+
+
+def main():
+    hex_str = build_inst_len().hex()
+    # 32 opcodes (64 hex digits) per line
+    lines = [hex_str[i:i + 64] for i in range(0, len(hex_str), 64)]
+    print("_INST_LEN = bytes.fromhex(")
+    for line in lines:
+        print(f"    '{line}'")
+    print(")")
+
+
+if __name__ == "__main__":
+    main()
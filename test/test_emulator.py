@@ -98,6 +98,23 @@ class TestUARTOutput:
         output = captured.getvalue()
         assert "Line1" in output, f"Expected 'Line1' in output, got: {repr(output)}"
 
+    def test_uart_raw_mode_drops_control_bytes(self):
+        """Test that raw UART output keeps printable text and newlines only."""
+        emu = Emulator(log_uart=False)
+        emu.reset()
+
+        old_stdout = sys.stdout
+        captured = io.StringIO()
+        sys.stdout = captured
+
+        try:
+            for value in b"OK\x00\x1b\xffhi\r\n":
+                emu.hw.write(0xC001, value)
+        finally:
+            sys.stdout = old_stdout
+
+        assert captured.getvalue() == "OKhi\r\n"
+
 
 class TestHardwareState:
     """Tests for hardware state management."""
@@ -138,6 +155,163 @@ class TestHardwareState:
 
         assert emu.hw.poll_counts.get(test_addr, 0) >= 5, "Poll count should increment"
 
+    def test_xdata_hook_table_mapping_helpers(self, emulator):
+        """Test that the flat XDATA hook tables keep dict-style lookups."""
+        emu = emulator
+        hooks = emu.memory.xdata_read_hooks
+
+        assert 0x0050 not in hooks
+        assert hooks.get(0x0050) is None
+
+        hooks[0x0050] = lambda addr: 0xA5
+        assert 0x0050 in hooks
+        assert emu.memory.read_xdata(0x0050) == 0xA5
+        assert 0x0050 in hooks.keys()
+
+        del hooks[0x0050]
+        assert 0x0050 not in hooks
+        assert emu.memory.read_xdata(0x0050) == emu.memory.xdata[0x0050]
+
+    def test_register_defaults_not_shared_between_instances(self, emulator):
+        """Test that each HardwareState gets its own copy of the default registers."""
+        from hardware import HardwareState
+
+        emulator.hw.regs[0x92C0] = 0x00
+        fresh = HardwareState()
+        assert fresh.regs[0x92C0] == 0x81
+        assert fresh.regs is not emulator.hw.regs
+
+    def test_generated_read_serves_consts_callbacks_and_regs(self):
+        """Test that the generated read checks fixed values, then callbacks, then regs."""
+        from hardware import HardwareState
+
+        hw = HardwareState()
+        addr = 0xB3F0
+        assert hw.const_reads[addr] < 0 and hw.read_callbacks[addr] is None
+
+        hw.regs[addr] = 0x12
+        assert hw.read(addr) == 0x12
+        hw.read_callbacks[addr] = lambda a: 0x5A
+        assert hw.read(addr) == 0x5A
+        hw.const_reads[addr] = 0x07
+        assert hw.read(addr) == 0x07
+        assert hw.poll_counts[addr] == 3
+
+    def test_set_logging_switches_mmio_log_output(self, emulator, capsys):
+        """Test that set_logging() turns MMIO read/write logging on and off."""
+        emu = emulator
+
+        emu.hw.set_logging(reads=True, writes=True)
+        emu.memory.write_xdata(0x9000, 0x81)
+        emu.memory.read_xdata(0x9000)
+        out = capsys.readouterr().out
+        assert "[HW] Write 0x9000 = 0x81" in out
+        assert "[HW] Read  0x9000 = 0x81" in out
+
+        emu.hw.set_logging(reads=False, writes=False)
+        emu.memory.write_xdata(0x9000, 0x00)
+        emu.memory.read_xdata(0x9000)
+        assert "[HW]" not in capsys.readouterr().out
+
+    def test_log_flags_reinstall_mmio_accessors(self, emulator, capsys):
+        """Test that assigning hw.log_reads/log_writes takes effect immediately."""
+        emu = emulator
+
+        emu.hw.log_reads = True
+        emu.memory.read_xdata(0x9000)
+        emu.memory.write_xdata(0x9000, 0x81)
+        out = capsys.readouterr().out
+        assert "[HW] Read  0x9000" in out
+        assert "[HW] Write" not in out
+
+        emu.hw.log_reads = False
+        emu.hw.log_writes = True
+        emu.memory.read_xdata(0x9000)
+        emu.memory.write_xdata(0x9000, 0x00)
+        out = capsys.readouterr().out
+        assert "[HW] Read" not in out
+        assert "[HW] Write 0x9000 = 0x00" in out
+        assert emu.memory.xdata_write_hooks[0x9000] is emu.hw.write
+
+    def test_dma_block_read_matches_byte_reads(self, emulator):
+        """Test that block DMA reads agree with byte-by-byte DMA reads."""
+        emu = emulator
+        hw = emu.hw
+        emu.memory.xdata[0x1000:0x1010] = bytes(range(0x10, 0x20))
+        emu.memory.code[0x0620:0x0640] = bytes(range(0x40, 0x60))
+
+        for addr, length in [(0x1000, 16), (0xE41C, 16), (0xE3F8, 16)]:
+            expected = bytes(hw._read_xdata_for_dma(addr + i) for i in range(length))
+            assert hw._read_xdata_block_for_dma(addr, length) == expected
+
+    def test_register_file_rejects_dict_style_membership(self, emulator):
+        """Test that regs refuses `in`/iteration instead of matching byte values."""
+        regs = emulator.hw.regs
+
+        assert regs.get(0x9000) == regs[0x9000]
+        assert regs.get(0x10000, 0xAA) == 0xAA
+        with pytest.raises(TypeError):
+            0x9000 in regs
+        with pytest.raises(TypeError):
+            iter(regs)
+        assert len(bytes(regs)) == 0x10000
+
+    def test_const_reads_ignore_writes(self, emulator):
+        """Test that fixed-value status registers read the same after writes."""
+        hw = emulator.hw
+
+        hw.write(0xC8D6, 0x00)
+        assert hw.read(0xC8D6) == 0x04, "DMA status should always read done"
+        hw.write(0xC8A9, 0x01)
+        assert hw.read(0xC8A9) == 0x00, "Flash CSR should always read idle"
+        assert hw.poll_counts.get(0xC8D6) == 1
+
+    def test_install_mmio_reroutes_mmio_hooks(self, emulator, capsys):
+        """Test that hw.install_mmio() reaches plain and watched MMIO addresses."""
+        emu = emulator
+        seen = []
+        original_write = emu.hw.write
+        emu.setup_watch(0x9001)
+
+        def track(addr, value):
+            seen.append((addr, value))
+            original_write(addr, value)
+
+        emu.hw.install_mmio(write=track)
+        emu.memory.write_xdata(0x9000, 0x81)
+        emu.memory.write_xdata(0x9001, 0x42)
+        assert seen == [(0x9000, 0x81), (0x9001, 0x42)]
+        assert emu.hw.regs[0x9000] == 0x81
+        assert "WRITE 0x9001 = 0x42" in capsys.readouterr().out
+
+        emu.hw.install_mmio(write=original_write)
+        emu.memory.write_xdata(0x9000, 0x00)
+        assert seen == [(0x9000, 0x81), (0x9001, 0x42)]
+        assert emu.memory.xdata_write_hooks[0x9000] is original_write
+
+        emu.hw.write = track  # plain assignment re-points the hooks too
+        emu.memory.write_xdata(0x9001, 0x43)
+        assert seen[-1] == (0x9001, 0x43)
+        emu.hw.write = original_write
+        assert emu.memory.xdata_write_hooks[0x9000] is original_write
+
+    def test_mmio_ranges_hooked_end_to_end(self, emulator):
+        """Test that register_xdata_range covers each MMIO range exactly."""
+        hooks = emulator.memory.xdata_read_hooks
+
+        assert 0x8000 in hooks and 0xE7FF in hooks
+        assert 0x7FFF not in hooks, "Flash buffer RAM must stay unhooked"
+        assert 0xE500 not in hooks
+        assert hooks[0x8000] is hooks[0xE7FF]
+
+    def test_mmio_ranges_merged_before_registration(self):
+        """Test that overlapping and abutting MMIO ranges are folded together."""
+        from hardware import _merge_ranges
+
+        ranges = [(0xE400, 0xE500), (0x9000, 0x9400), (0x8000, 0x9000),
+                  (0x92C0, 0x9300), (0xE300, 0xE400), (0xE700, 0xE800)]
+        assert _merge_ranges(ranges) == [(0x8000, 0x9400), (0xE300, 0xE500), (0xE700, 0xE800)]
+
 
 class TestEmulatorExecution:
     """Tests for basic emulator execution."""
@@ -319,6 +493,29 @@ class TestTimerEmulation:
         # Complete bit should be set
         assert value & 0x02, "Timer/DMA complete bit should be set after polling"
 
+    def test_periodic_timer_fires_on_exact_thousands(self):
+        """Test that tick() sets C806 bit 0 exactly when cycles land on a multiple of 1000."""
+        from hardware import HardwareState
+
+        hw = HardwareState(usb_connected=True)
+        steps = [1, 2, 3, 4] * 1200 + [997, 3, 1000, 2500, 500]
+        for step in steps:
+            hw.regs[0xC806] = 0x00
+            hw.tick(step)
+            expected = 0x01 if hw.cycles % 1000 == 0 else 0x00
+            assert hw.regs[0xC806] == expected, f"cycles={hw.cycles}"
+
+    def test_busy_register_clears_after_polls(self, emulator):
+        """Test that the flash/DMA busy bit auto-clears after three polls."""
+        emu = emulator
+
+        emu.hw.write(0xC8B8, 0x01)
+        emu.hw.poll_counts[0xC8B8] = 0
+
+        values = [emu.hw.read(0xC8B8) for _ in range(4)]
+
+        assert values == [0x01, 0x01, 0x00, 0x00]
+
 
 class TestUSBStateMachine:
     """Tests for USB state machine progression."""
@@ -484,6 +681,18 @@ class TestCodeBanking:
         # Should be identical (lower 32KB ignores bank)
         assert byte_dpx0 == byte_dpx1, f"[{fw_name}] Lower 32KB should ignore bank setting"
 
+    def test_read_code_block_matches_read_code(self, firmware_emulator):
+        """Test that block code reads agree with per-byte reads in both banks."""
+        emu, fw_name = firmware_emulator
+
+        for dpx in (0x00, 0x01):
+            emu.memory.sfr[0x96 - 0x80] = dpx
+            # Includes blocks straddling the bank window and the 64KB wrap
+            for addr in (0x0000, 0x1000, 0x7FFE, 0x7FFF, 0x8000, 0xC000, 0xFFFE, 0xFFFF):
+                expected = bytes(emu.memory.read_code(addr + i) for i in range(3))
+                assert emu.memory.read_code_block(addr, 3) == expected, \
+                    f"[{fw_name}] Block read mismatch at 0x{addr:04X} (DPX={dpx})"
+
 
 class TestBitOperations:
     """End-to-end tests for 8051 bit-addressable memory."""
@@ -580,10 +789,10 @@ class TestFirmwareExecution:
         uart_chars = []
         original_uart_tx = emu.hw._uart_tx
 
-        def capture_uart(hw, addr, value):
+        def capture_uart(addr, value):
             if 0x20 <= value < 0x7F:
                 uart_chars.append(chr(value))
-            original_uart_tx(hw, addr, value)
+            original_uart_tx(addr, value)
 
         emu.hw.write_callbacks[0xC000] = capture_uart
         emu.hw.write_callbacks[0xC001] = capture_uart
@@ -655,6 +864,112 @@ class TestTracingFunctionality:
 
         assert len(emu.hw.xdata_write_log) == 3, "Should log all writes"
 
+    def test_watch_logs_reads_and_writes(self, emulator):
+        """Test that watched XDATA addresses log accesses and keep their data."""
+        emu = emulator
+
+        emu.setup_watch(0x0100, "VAR_A")
+        emu.setup_watch(0x0101)
+
+        old_stdout = sys.stdout
+        captured = io.StringIO()
+        sys.stdout = captured
+        try:
+            emu.memory.write_xdata(0x0100, 0x5A)
+            value = emu.memory.read_xdata(0x0100)
+            emu.memory.write_xdata(0x0101, 0x11)
+            emu.flush_log()
+        finally:
+            sys.stdout = old_stdout
+
+        output = captured.getvalue()
+        assert value == 0x5A, "Watched write should reach XDATA"
+        assert "WRITE VAR_A = 0x5A" in output
+        assert "READ  VAR_A = 0x5A" in output
+        assert "WRITE 0x0101 = 0x11" in output
+
+    def test_trace_property_toggles_instruction_trace(self, emulator, capsys):
+        """Test that Emulator.trace is the one switch for instruction tracing."""
+        emu = emulator
+        emu.memory.code[0x0000] = 0x74  # MOV A,#11h
+        emu.memory.code[0x0001] = 0x11
+        emu.memory.code[0x0002] = 0x00  # NOP
+
+        emu.trace = True
+        assert emu.trace
+        emu.step()
+        emu.flush_log()
+        assert "MOV A,#11" in capsys.readouterr().out
+
+        emu.trace = False
+        assert not emu.trace
+        emu.step()
+        emu.flush_log()
+        assert "NOP" not in capsys.readouterr().out
+
+    def test_trace_follows_patched_code(self, emulator, capsys):
+        """Test that the instruction trace decodes code bytes patched at runtime."""
+        emu = emulator
+        emu.memory.code[0x0000] = 0x74  # MOV A,#11h
+        emu.memory.code[0x0001] = 0x11
+        emu.trace = True
+        emu.step()
+
+        emu.memory.code[0x0001] = 0x33  # MOV A,#33h
+        emu.cpu.pc = 0x0000
+        emu.step()
+        emu.flush_log()
+
+        out = capsys.readouterr().out
+        assert emu.cpu.A == 0x33
+        assert "MOV A,#11" in out and "MOV A,#33" in out
+
+    def test_trace_pcs_bitmap_behaves_like_set(self, emulator):
+        """Test that the bitmap-backed trace_pcs supports the set operations used."""
+        emu = emulator
+
+        assert not emu.trace_pcs
+        emu.trace_pcs.add(0x43A3)
+        emu.trace_pcs.add(0x43A3)
+        emu.trace_pcs.add(0xFFFF)
+
+        assert len(emu.trace_pcs) == 2
+        assert 0x43A3 in emu.trace_pcs and 0xFFFF in emu.trace_pcs
+        assert 0x43A2 not in emu.trace_pcs
+        assert sorted(emu.trace_pcs) == [0x43A3, 0xFFFF]
+
+        emu.trace_pcs.discard(0x43A3)
+        assert 0x43A3 not in emu.trace_pcs
+        assert len(emu.trace_pcs) == 1
+
+    def test_breakpoint_stops_run(self, emulator):
+        """Test that a CPU breakpoint halts run() at that PC."""
+        emu = emulator
+        # LJMP to a tight SJMP loop, with a breakpoint on the loop
+        emu.memory.code[0x0000] = 0x02  # LJMP 0x0010
+        emu.memory.code[0x0001] = 0x00
+        emu.memory.code[0x0002] = 0x10
+        emu.memory.code[0x0010] = 0x80  # SJMP -2
+        emu.memory.code[0x0011] = 0xFE
+        emu.cpu.breakpoints.add(0x0010)
+
+        reason = emu.run(max_instructions=100)
+
+        assert reason == "breakpoint"
+        assert emu.cpu.pc == 0x0010
+        assert emu.cpu.halted
+
+    def test_inst_len_table_matches_opcode_map(self):
+        """Test that the generated _INST_LEN table agrees with disasm8051.INSTRUCTIONS."""
+        from emu import _INST_LEN
+        from disasm8051 import INSTRUCTIONS
+
+        assert len(_INST_LEN) == 256
+        for opcode in range(256):
+            expected = INSTRUCTIONS[opcode][1] if opcode in INSTRUCTIONS else 1
+            assert _INST_LEN[opcode] == expected, \
+                f"_INST_LEN[0x{opcode:02X}] is stale; rerun scripts/gen_inst_len.py"
+
 
 class TestSyncFlagBehavior:
     """End-to-end tests for DMA/timer sync flag handling."""
@@ -930,6 +1245,17 @@ class TestScsiWriteCommand:
         for i in range(len(test_data), 512):
             assert emu.memory.xdata[0x8000 + i] == 0x00, f"Byte {i} should be padded to 0x00"
 
+    def test_scsi_write_clamped_to_xdata_end(self, emulator):
+        """Test SCSI write data past 0xFFFF is dropped without resizing XDATA."""
+        emu = emulator
+
+        emu.hw.inject_scsi_write(lba=0, sectors=65, data=b'\xA5' * (65 * 512))
+
+        assert len(emu.memory.xdata) == 0x10000
+        assert emu.memory.xdata[0x8000] == 0xA5
+        assert emu.memory.xdata[0xFFFF] == 0xA5
+        assert emu.hw.usb_data_len == 65 * 512
+
     def test_scsi_write_sets_command_pending(self, emulator):
         """Test SCSI write sets command pending flag."""
         emu = emulator
@@ -1086,10 +1412,10 @@ class TestDMATriggerSequence:
         writes_b296 = []
         original_write = emu.hw.write_callbacks.get(0xB296)
 
-        def track_b296(hw, addr, val):
+        def track_b296(addr, val):
             writes_b296.append(val)
             if original_write:
-                original_write(hw, addr, val)
+                original_write(addr, val)
 
         emu.hw.write_callbacks[0xB296] = track_b296
 
@@ -1823,7 +2149,7 @@ class TestUSBControlTransfer:
 
         # Read through the callback (simulates firmware reading 0x9E00)
         for i, expected in enumerate(test_data):
-            result = emu.hw._usb_ep0_buf_read(emu.hw, 0x9E00 + i)
+            result = emu.hw._usb_ep0_buf_read(0x9E00 + i)
             assert result == expected, f"[{fw_name}] EP0 buf[{i}] should be 0x{expected:02X}"
 
     def test_control_transfer_get_descriptor(self, firmware_emulator):
@@ -2091,7 +2417,7 @@ class TestUSBDescriptorInit:
 
         # Also search MMIO regs
         found_in_regs = []
-        for addr in emu.hw.regs:
+        for addr in range(len(emu.hw.regs) - 1):
             if emu.hw.regs.get(addr, 0) == vid_low:
                 if emu.hw.regs.get(addr + 1, 0) == vid_high:
                     found_in_regs.append(addr)